@@ -0,0 +1,163 @@
+import bisect
+import threading
+from datetime import date
+
+CLOSED_STATUSES = ("completed", "cancelled")
+REMIND_DAYS = 3
+
+
+def due_ordinal(action):
+    due_date = action.get("due_date")
+    if not due_date or action.get("status") in CLOSED_STATUSES:
+        return None
+    try:
+        return date.fromisoformat(due_date).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def add_to_bucket(buckets, days, ordinal, action):
+    bucket = buckets.get(ordinal)
+    if bucket is None:
+        bucket = buckets[ordinal] = {}
+        bisect.insort(days, ordinal)
+    bucket[action["id"]] = action
+
+
+def remove_from_bucket(buckets, days, ordinal, action_id):
+    bucket = buckets[ordinal]
+    del bucket[action_id]
+    if not bucket:
+        del buckets[ordinal]
+        del days[bisect.bisect_left(days, ordinal)]
+
+
+class ActionScheduler:
+    # Day-granularity timing wheel: open actions are bucketed by due date and
+    # the non-empty days are kept sorted, so overdue/upcoming queries walk
+    # only the buckets that hold hits. The same buckets are kept per org
+    # (org -> sorted days -> ids), resolved through `org_of`, so an org
+    # filter never visits other orgs' actions. tick() advances a cursor and
+    # fires events for buckets that cross the overdue or reminder boundary.
+    def __init__(self, today=None, remind_days=REMIND_DAYS, org_of=None):
+        self.remind_days = remind_days
+        self.cursor = (today or date.today()).toordinal()
+        self.org_of = org_of or (lambda action: None)
+        self.buckets = {}
+        self.days = []
+        self.org_buckets = {}
+        self.org_days = {}
+        self.placement = {}
+        self.listeners = []
+        self.lock = threading.Lock()
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+
+    def load(self, actions):
+        with self.lock:
+            for action in actions:
+                self.place(action)
+
+    def reindex(self):
+        # Re-resolves every action's org, e.g. after the org data changed.
+        with self.lock:
+            actions = [action for bucket in self.buckets.values() for action in bucket.values()]
+            for action in actions:
+                self.unplace(action["id"])
+                self.place(action)
+
+    def window(self, ordinal):
+        if ordinal < self.cursor:
+            return "overdue"
+        if ordinal <= self.cursor + self.remind_days:
+            return "upcoming"
+        return None
+
+    def upsert(self, action):
+        with self.lock:
+            previous = self.placement.get(action["id"])
+            self.unplace(action["id"])
+            ordinal = self.place(action)
+        if ordinal is None:
+            return
+        # Only a move into a window is an event; edits that leave the action
+        # where it was (or move it within the window) are not.
+        kind = self.window(ordinal)
+        if kind and (previous is None or self.window(previous[0]) != kind):
+            self.fire(kind, action, ordinal)
+
+    def remove(self, action_id):
+        with self.lock:
+            self.unplace(action_id)
+
+    def place(self, action):
+        ordinal = due_ordinal(action)
+        if ordinal is None:
+            return None
+        org_id = self.org_of(action)
+        add_to_bucket(self.buckets, self.days, ordinal, action)
+        add_to_bucket(self.org_buckets.setdefault(org_id, {}), self.org_days.setdefault(org_id, []), ordinal, action)
+        self.placement[action["id"]] = (ordinal, org_id)
+        return ordinal
+
+    def unplace(self, action_id):
+        placed = self.placement.pop(action_id, None)
+        if placed is None:
+            return
+        ordinal, org_id = placed
+        remove_from_bucket(self.buckets, self.days, ordinal, action_id)
+        remove_from_bucket(self.org_buckets[org_id], self.org_days[org_id], ordinal, action_id)
+        if not self.org_days[org_id]:
+            del self.org_buckets[org_id]
+            del self.org_days[org_id]
+
+    def scan(self, start, end, limit=None, org_id=None):
+        # Buckets with start <= day < end, oldest first.
+        hits = []
+        with self.lock:
+            if org_id is None:
+                buckets, days = self.buckets, self.days
+            else:
+                buckets, days = self.org_buckets.get(org_id, {}), self.org_days.get(org_id, [])
+            index = bisect.bisect_left(days, start)
+            while index < len(days) and days[index] < end:
+                ordinal = days[index]
+                for action in buckets[ordinal].values():
+                    hits.append((ordinal, action))
+                    if limit is not None and len(hits) >= limit:
+                        return hits
+                index += 1
+        return hits
+
+    def overdue(self, today=None, limit=None, org_id=None):
+        today = (today or date.today()).toordinal()
+        return [
+            {**action, "overdue_days": today - ordinal}
+            for ordinal, action in self.scan(0, today, limit, org_id)
+        ]
+
+    def upcoming(self, today=None, days=REMIND_DAYS, limit=None, org_id=None):
+        today = (today or date.today()).toordinal()
+        return [
+            {**action, "days_left": ordinal - today}
+            for ordinal, action in self.scan(today, today + days + 1, limit, org_id)
+        ]
+
+    def tick(self, today=None):
+        today = (today or date.today()).toordinal()
+        if today <= self.cursor:
+            return
+        previous = self.cursor
+        overdue = self.scan(previous, today)
+        upcoming = self.scan(previous + self.remind_days + 1, today + self.remind_days + 1)
+        self.cursor = today
+        for ordinal, action in overdue:
+            self.fire("overdue", action, ordinal)
+        for ordinal, action in upcoming:
+            self.fire("upcoming", action, ordinal)
+
+    def fire(self, kind, action, ordinal):
+        event = {"type": kind, "action_id": action["id"], "due_date": date.fromordinal(ordinal).isoformat()}
+        for listener in self.listeners:
+            listener(event)
@@ -1,8 +1,28 @@
 import os
+import threading
+import time
 import uuid
+from collections import deque
 from datetime import date, timedelta
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+from action_scheduler import REMIND_DAYS, ActionScheduler
+from export import (
+    DATASETS,
+    DATED_DATASETS,
+    FORMATS,
+    iter_action_rows,
+    iter_gap_rows,
+    iter_matrix_rows,
+    parse_date_range,
+    stream_rows,
+)
+from org_tree import MAX_TREE_DEPTH, OrgTreeIndex
+from recompute import SnapshotReader
+from skill_index import SkillIndex
+from snapshot import RecordTable, current_name as snapshot_current_name, open_current as open_snapshot
+from trend_store import GRANULARITIES, TrendStore, recent_month_starts, seed_from_monthly
 
 app = Flask(__name__)
 
@@ -47,112 +67,128 @@ ORGANIZATIONS = [
 POSITIONS = [
     {
         "id": "pos_sales_manager",
+        "name": "销售经理",
         "organization_id": "org_dept_north_sales",
         "required_skills": ["客户关系", "谈判", "数据分析"],
+        "hard_skills": ["客户关系"],
     },
     {
         "id": "pos_product_manager",
+        "name": "产品经理",
         "organization_id": "org_dept_growth",
         "required_skills": ["产品规划", "增长策略", "数据洞察"],
+        "hard_skills": ["产品规划"],
     },
     {
         "id": "pos_data_analyst",
+        "name": "数据分析师",
         "organization_id": "org_dept_growth",
         "required_skills": ["数据建模", "指标拆解", "业务洞察"],
+        "hard_skills": ["数据建模"],
     },
     {
         "id": "pos_customer_success",
+        "name": "客户成功",
         "organization_id": "org_dept_north_sales",
         "required_skills": ["客户成功", "项目协同", "复盘能力"],
+        "hard_skills": ["客户成功"],
     },
     {
         "id": "pos_operations_lead",
+        "name": "运营主管",
         "organization_id": "org_dept_north_sales",
         "required_skills": ["运营规划", "数据洞察", "流程优化"],
+        "hard_skills": ["运营规划"],
     },
 ]
 
 EMPLOYEES = [
     {
         "id": "emp_001",
+        "name": "王敏",
         "organization_id": "org_dept_growth",
         "position_id": "pos_product_manager",
         "risk_level": "medium",
+        "skills": ["产品规划", "增长策略", "协作沟通"],
     },
     {
         "id": "emp_002",
+        "name": "李昊",
         "organization_id": "org_dept_growth",
         "position_id": "pos_data_analyst",
         "risk_level": "low",
+        "skills": ["数据建模", "指标拆解", "逻辑推理"],
     },
     {
         "id": "emp_003",
+        "name": "陈佳",
         "organization_id": "org_dept_growth",
         "position_id": "pos_product_manager",
         "risk_level": "medium",
+        "skills": ["产品规划", "数据洞察"],
     },
     {
         "id": "emp_101",
+        "name": "刘思",
         "organization_id": "org_dept_north_sales",
         "position_id": "pos_sales_manager",
         "risk_level": "high",
+        "skills": ["客户关系", "谈判"],
     },
     {
         "id": "emp_102",
+        "name": "吴凯",
         "organization_id": "org_dept_north_sales",
         "position_id": "pos_operations_lead",
         "risk_level": "medium",
+        "skills": ["运营规划", "流程优化", "数据洞察"],
     },
     {
         "id": "emp_103",
+        "name": "赵航",
         "organization_id": "org_dept_north_sales",
         "position_id": "pos_customer_success",
         "risk_level": "medium",
+        "skills": ["客户成功", "复盘能力"],
     },
 ]
 
-ACTIONS = [
-    {
-        "id": "action_org_active_1",
-        "target_object_type": "Organization",
-        "target_object_id": "org_group",
-        "action_type": "org_optimization",
-        "status": "active",
-        "title": "组织匹配度提升专项",
-        "expected_impact": "匹配度提升 3-5 分",
-        "effort": "3周",
-        "execution_method": "HRBP 牵头 + 业务负责人配合",
-        "assignee": "HRBP 张敏",
-        "due_date": (date.today() + timedelta(days=21)).isoformat(),
-        "progress": 25,
-    },
-    {
-        "id": "action_emp_active_1",
-        "target_object_type": "Employee",
-        "target_object_id": "emp_101",
-        "action_type": "job_transfer",
-        "status": "active",
-        "title": "个人能力差距提升计划",
-        "expected_impact": "匹配度提升 4 分",
-        "effort": "2周",
-        "execution_method": "直属主管跟进",
-        "assignee": "HRBP 李婷",
-        "due_date": (date.today() + timedelta(days=14)).isoformat(),
-        "progress": 35,
-    },
-]
+# Newest first; a deque so create_action prepends in O(1).
+ACTIONS = deque(
+    [
+        {
+            "id": "action_org_active_1",
+            "target_object_type": "Organization",
+            "target_object_id": "org_group",
+            "action_type": "org_optimization",
+            "status": "active",
+            "title": "组织匹配度提升专项",
+            "expected_impact": "匹配度提升 3-5 分",
+            "effort": "3周",
+            "execution_method": "HRBP 牵头 + 业务负责人配合",
+            "assignee": "HRBP 张敏",
+            "due_date": (date.today() + timedelta(days=21)).isoformat(),
+            "progress": 25,
+        },
+        {
+            "id": "action_emp_active_1",
+            "target_object_type": "Employee",
+            "target_object_id": "emp_101",
+            "action_type": "job_transfer",
+            "status": "active",
+            "title": "个人能力差距提升计划",
+            "expected_impact": "匹配度提升 4 分",
+            "effort": "2周",
+            "execution_method": "直属主管跟进",
+            "assignee": "HRBP 李婷",
+            "due_date": (date.today() + timedelta(days=14)).isoformat(),
+            "progress": 35,
+        },
+    ]
+)
+ACTIONS_BY_ID = {action["id"]: action for action in ACTIONS}
 
 JOB_FIT_BASE = {
-    "employeeOptions": [
-        {"label": "王敏｜产品事业部｜产品经理", "value": "emp_001"},
-        {"label": "李昊｜增长产品部｜数据分析师", "value": "emp_002"},
-        {"label": "陈佳｜产品事业部｜增长产品经理", "value": "emp_003"},
-    ],
-    "roleOptions": [
-        {"label": "产品经理", "value": "pos_product_manager"},
-        {"label": "数据分析师", "value": "pos_data_analyst"},
-        {"label": "销售经理", "value": "pos_sales_manager"},
-    ],
     "summary": {
         "avgMatch": 78,
         "level": "中匹配",
@@ -288,16 +324,6 @@ JOB_FIT_BASE = {
 
 JOB_FIT_BY_ORG = {
     "org_bu_sales": {
-        "employeeOptions": [
-            {"label": "刘思｜销售事业部｜销售经理", "value": "emp_101"},
-            {"label": "吴凯｜销售事业部｜运营主管", "value": "emp_102"},
-            {"label": "赵航｜销售事业部｜客户成功", "value": "emp_103"},
-        ],
-        "roleOptions": [
-            {"label": "销售经理", "value": "pos_sales_manager"},
-            {"label": "客户成功", "value": "pos_customer_success"},
-            {"label": "运营主管", "value": "pos_operations_lead"},
-        ],
         "summary": {"avgMatch": 72, "level": "中匹配", "risk": "高", "keyFinding": "销售岗位沟通与数据洞察缺口扩大。"},
         "distribution": {"high": 10, "medium": 18, "low": 8, "hardMismatch": 3},
         "trendSeries": [
@@ -330,9 +356,312 @@ JOB_FIT_BY_ORG = {
 }
 
 
-def build_jobfit_action_suggestions(payload, org_id):
+def build_skill_index(positions, employees):
+    index = SkillIndex()
+    for position in positions:
+        index.set_position(position["id"], position["required_skills"], position.get("hard_skills"))
+    index.load_employees(
+        (employee["id"], employee.get("skills", []), employee["organization_id"]) for employee in employees
+    )
+    return index
+
+
+def build_skill_match(employee_id, position_id):
+    skill_index = SKILL_INDEX.get()
+    if not skill_index.has_employee(employee_id) or not skill_index.has_position(position_id):
+        return None
+    return skill_index.compare(employee_id, position_id)
+
+
+def apply_skill_matches(payload):
+    by_employee = {}
+    for employee_id, detail in payload.get("singleMatchByEmployee", {}).items():
+        employee = find_employee(employee_id)
+        match = build_skill_match(employee_id, employee["position_id"]) if employee else None
+        by_employee[employee_id] = {**detail, **match} if match else detail
+    if not by_employee:
+        return payload
+    single = payload.get("singleMatch") or {}
+    return {
+        **payload,
+        "singleMatchByEmployee": by_employee,
+        "singleMatch": next(
+            (detail for detail in by_employee.values() if detail.get("employee") == single.get("employee")), single
+        ),
+    }
+
+
+SEARCH_TYPES = ("organization", "employee", "position")
+SEARCH_MAX_LIMIT = 50
+
+
+def index_organization(index, org):
+    index.upsert("organization", org["id"], org["name"], label=org["name"], organization_id=org["id"])
+
+
+def index_position(index, position):
+    index.upsert(
+        "position",
+        position["id"],
+        position["name"],
+        context=(("organization", position["organization_id"]),),
+        label=position["name"],
+        organization_id=position["organization_id"],
+    )
+
+
+def index_employee(index, employee, org, position):
+    org_name = org["name"] if org else ""
+    role_name = position["name"] if position else ""
+    index.upsert(
+        "employee",
+        employee["id"],
+        employee["name"],
+        context=(("organization", employee["organization_id"]), ("position", employee["position_id"])),
+        label="｜".join(part for part in (employee["name"], org_name, role_name) if part),
+        organization_id=employee["organization_id"],
+    )
+
+
+def build_search_index(organizations, positions, employees, tree):
+    # Imported here: loading pypinyin's dictionaries would add ~0.3 s to startup.
+    from search_index import SearchIndex
+
+    index = SearchIndex()
+    positions_by_id = {position["id"]: position for position in positions}
+    for org in organizations:
+        index_organization(index, org)
+    for position in positions:
+        index_position(index, position)
+    for employee in employees:
+        index_employee(
+            index, employee, tree.get(employee["organization_id"]), positions_by_id.get(employee["position_id"])
+        )
+    return index
+
+
+def load_snapshot_tables(snapshot):
+    return snapshot.table("organizations"), snapshot.table("positions"), snapshot.table("employees")
+
+
+class LazyIndex:
+    # Derived index built on first use, so activating a dataset only pays for
+    # the org tree; warm_indexes() normally builds it before a request asks.
+    def __init__(self, build, *args):
+        self.build = build
+        self.args = args
+        self.value = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        if self.value is None:
+            with self.lock:
+                if self.value is None:
+                    self.value = self.build(*self.args)
+                    self.args = ()
+        return self.value
+
+
+def build_row_index(records):
+    if isinstance(records, RecordTable):
+        return records.row_index("id")
+    return {record["id"]: row for row, record in enumerate(records)}
+
+
+class RowLookup:
+    # id -> record over a record list, through an id -> row map.
+    def __init__(self, records):
+        self.records = records
+        self.rows = LazyIndex(build_row_index, records)
+
+    def get(self, record_id):
+        row = self.rows.get().get(record_id)
+        return None if row is None else self.records[row]
+
+
+def warm_indexes(indexes):
+    for index in indexes:
+        index.get()
+
+
+def activate_dataset(organizations, positions, employees, warm=False):
+    # With warm=True (snapshot switch-over) every index is built before any
+    # global is rebound, so requests keep using the previous dataset until
+    # the new one is complete. At startup the globals are bound right away
+    # and the indexes are built in the background.
+    global ORGANIZATIONS, POSITIONS, EMPLOYEES, ORG_TREE, EMPLOYEE_LOOKUP, POSITION_LOOKUP
+    global SKILL_INDEX, SEARCH_INDEX
+    tree = OrgTreeIndex(organizations)
+    employee_lookup = RowLookup(employees)
+    position_lookup = RowLookup(positions)
+    skill_index = LazyIndex(build_skill_index, positions, employees)
+    search_index = LazyIndex(build_search_index, organizations, positions, employees, tree)
+    indexes = (employee_lookup.rows, position_lookup.rows, skill_index, search_index)
+    if warm:
+        warm_indexes(indexes)
+    ORGANIZATIONS, POSITIONS, EMPLOYEES = organizations, positions, employees
+    ORG_TREE, EMPLOYEE_LOOKUP, POSITION_LOOKUP = tree, employee_lookup, position_lookup
+    SKILL_INDEX, SEARCH_INDEX = skill_index, search_index
+    if not warm:
+        threading.Thread(target=warm_indexes, args=(indexes,), daemon=True).start()
+
+
+def watch_data_snapshot(loaded_name):
+    while True:
+        time.sleep(SNAPSHOT_POLL_SECONDS)
+        name = snapshot_current_name()
+        if not name or name == loaded_name:
+            continue
+        try:
+            activate_dataset(*load_snapshot_tables(open_snapshot()), warm=True)
+            # Employees and positions may have moved between orgs.
+            ACTION_SCHEDULER.reindex()
+            loaded_name = name
+        except (OSError, ValueError):
+            app.logger.exception("failed to activate snapshot %s", name)
+
+
+SNAPSHOT_POLL_SECONDS = 5
+DATA_SNAPSHOT = open_snapshot()
+if DATA_SNAPSHOT:
+    activate_dataset(*load_snapshot_tables(DATA_SNAPSHOT))
+else:
+    activate_dataset(ORGANIZATIONS, POSITIONS, EMPLOYEES)
+# Also started without a snapshot, so the first published one is picked up.
+threading.Thread(
+    target=watch_data_snapshot,
+    args=(os.path.basename(DATA_SNAPSHOT.path) if DATA_SNAPSHOT else None,),
+    daemon=True,
+).start()
+
+
+JOBFIT_SNAPSHOT = SnapshotReader()
+
+
+def watch_jobfit_snapshot():
+    # Newly published recompute results are loaded here, off the request
+    # path, and swapped in whole.
+    while True:
+        time.sleep(SNAPSHOT_POLL_SECONDS)
+        try:
+            JOBFIT_SNAPSHOT.refresh()
+        except (OSError, ValueError):
+            app.logger.exception("failed to load job-fit snapshot")
+
+
+threading.Thread(target=watch_jobfit_snapshot, daemon=True).start()
+
+
+def apply_jobfit_snapshot(payload, org_id):
+    result = JOBFIT_SNAPSHOT.org_result(org_id)
+    if not result:
+        return payload
+    # The recompute job has no trend history, so the trend rule is evaluated
+    # against the live series and slotted in after the distribution rules,
+    # where build_jobfit_action_suggestions puts it. The mock keyFinding does
+    # not describe recomputed data and is dropped.
+    suggestions = list(result["actionSuggestions"])
+    trend_suggestion = build_trend_suggestion(payload.get("trendSeries", []), org_id)
+    if trend_suggestion:
+        position = len(build_distribution_suggestions(result["distribution"], org_id))
+        suggestions = (suggestions[:position] + [trend_suggestion] + suggestions[position:])[:5]
+    return {
+        **payload,
+        "summary": result["summary"],
+        "distribution": result["distribution"],
+        "matrix": result["matrix"],
+        "capabilityGaps": result["capabilityGaps"],
+        "actionSuggestions": suggestions,
+    }
+
+
+def find_org(org_id):
+    return ORG_TREE.get(org_id)
+
+
+def action_org_id(action):
+    if action["target_object_type"] == "Organization":
+        return action["target_object_id"]
+    if action["target_object_type"] == "Employee":
+        employee = find_employee(action["target_object_id"])
+        return employee["organization_id"] if employee else None
+    if action["target_object_type"] == "Position":
+        position = find_position(action["target_object_id"])
+        return position["organization_id"] if position else None
+    return None
+
+
+def find_employee(employee_id):
+    return EMPLOYEE_LOOKUP.get(employee_id)
+
+
+def find_position(position_id):
+    return POSITION_LOOKUP.get(position_id)
+
+
+ACTION_TICK_SECONDS = 60
+ACTION_QUERY_MAX_LIMIT = 1000
+ACTION_EVENTS = deque(maxlen=1000)
+ACTION_SCHEDULER = ActionScheduler(org_of=action_org_id)
+ACTION_SCHEDULER.subscribe(ACTION_EVENTS.append)
+ACTION_SCHEDULER.load(ACTIONS)
+
+
+def tick_action_scheduler():
+    while True:
+        time.sleep(ACTION_TICK_SECONDS)
+        ACTION_SCHEDULER.tick()
+
+
+threading.Thread(target=tick_action_scheduler, daemon=True).start()
+
+
+TREND_METRIC_JOB_FIT = "job_fit"
+TREND_METRICS = (TREND_METRIC_JOB_FIT,)
+TREND_STORE = TrendStore()
+
+
+def trend_source(org_id, metric):
+    # Orgs without ingested history fall back to the legacy six-month list,
+    # expanded into a throwaway store so it never lands in TREND_STORE.
+    if metric != TREND_METRIC_JOB_FIT or TREND_STORE.has_series(org_id, metric):
+        return TREND_STORE
+    fallback = TrendStore()
+    trend = JOB_FIT_BY_ORG.get(org_id, {}).get("trendSeries", JOB_FIT_BASE["trendSeries"])
+    seed_from_monthly(fallback, org_id, metric, [item["score"] for item in trend])
+    return fallback
+
+
+def build_trend_series(org_id, months=6):
+    start = recent_month_starts(months)[0]
+    points = trend_source(org_id, TREND_METRIC_JOB_FIT).query(
+        org_id, TREND_METRIC_JOB_FIT, start=start, granularity="month"
+    )
+    return [
+        {"period": f"{date.fromisoformat(point['period']).month}月", "score": round(point["score"])}
+        for point in points
+    ]
+
+
+def build_trend_suggestion(trend, org_id):
+    if len(trend) < 2 or trend[-1]["score"] >= trend[-2]["score"]:
+        return None
+    return {
+        "title": "匹配度回升专项复盘",
+        "priority": "P1",
+        "effect": "匹配度回升 2-3 分",
+        "plan": "复盘近两期能力差距与业务指标变化，调整岗位权重配置。",
+        "effort_time": "2周",
+        "effort_cost": "",
+        "actionType": "org_optimization",
+        "targetType": "Organization",
+        "targetId": org_id,
+        "rationale": "匹配度环比下降",
+    }
+
+
+def build_distribution_suggestions(distribution, org_id):
     suggestions = []
-    distribution = payload.get("distribution", {})
     low_count = distribution.get("low", 0)
     hard_mismatch = distribution.get("hardMismatch", 0)
 
@@ -368,22 +697,15 @@ def build_jobfit_action_suggestions(payload, org_id):
             }
         )
 
-    trend = payload.get("trendSeries", [])
-    if len(trend) >= 2 and trend[-1]["score"] < trend[-2]["score"]:
-        suggestions.append(
-            {
-                "title": "匹配度回升专项复盘",
-                "priority": "P1",
-                "effect": "匹配度回升 2-3 分",
-                "plan": "复盘近两期能力差距与业务指标变化，调整岗位权重配置。",
-                "effort_time": "2周",
-                "effort_cost": "",
-                "actionType": "org_optimization",
-                "targetType": "Organization",
-                "targetId": org_id,
-                "rationale": "匹配度环比下降",
-            }
-        )
+    return suggestions
+
+
+def build_jobfit_action_suggestions(payload, org_id):
+    suggestions = build_distribution_suggestions(payload.get("distribution", {}), org_id)
+
+    trend_suggestion = build_trend_suggestion(payload.get("trendSeries", []), org_id)
+    if trend_suggestion:
+        suggestions.append(trend_suggestion)
 
     matrix = payload.get("matrix", [])
     if matrix:
@@ -463,17 +785,87 @@ def create_action(object_type, object_id, action_type, expected_impact):
         "due_date": (date.today() + timedelta(days=14)).isoformat(),
         "progress": 0,
     }
-    ACTIONS.insert(0, action)
+    ACTIONS.appendleft(action)
+    ACTIONS_BY_ID[action["id"]] = action
+    ACTION_SCHEDULER.upsert(action)
     return action
 
 
-def find_org(org_id):
-    return next((org for org in ORGANIZATIONS if org["id"] == org_id), None)
-
-
 @app.get("/api/organizations")
 def list_organizations():
-    return jsonify({"data": ORGANIZATIONS})
+    return jsonify({"data": list(ORGANIZATIONS)})
+
+
+@app.get("/api/organizations/tree")
+def get_organization_tree():
+    root_id = request.args.get("root_id")
+    try:
+        depth = int(request.args.get("depth", "1"))
+    except ValueError:
+        return jsonify({"error": "invalid_depth"}), 400
+    depth = max(0, min(depth, MAX_TREE_DEPTH))
+    if not root_id:
+        return jsonify({"data": ORG_TREE.forest(depth)})
+    if not find_org(root_id):
+        return jsonify({"error": "organization_not_found"}), 404
+    return jsonify({"data": [ORG_TREE.subtree(root_id, depth)]})
+
+
+@app.get("/api/organizations/<org_id>/children")
+def get_organization_children(org_id):
+    if not find_org(org_id):
+        return jsonify({"error": "organization_not_found"}), 404
+    return jsonify({"data": ORG_TREE.children(org_id)})
+
+
+@app.get("/api/search")
+def search():
+    query = request.args.get("q", "")
+    types = [item for item in request.args.get("types", "").split(",") if item]
+    if any(item not in SEARCH_TYPES for item in types):
+        return jsonify({"error": "invalid_types"}), 400
+    try:
+        limit = int(request.args.get("limit", "10"))
+    except ValueError:
+        return jsonify({"error": "invalid_limit"}), 400
+    limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+    scope = None
+    org_id = request.args.get("org_id")
+    if org_id:
+        if not find_org(org_id):
+            return jsonify({"error": "organization_not_found"}), 404
+        scope = set(ORG_TREE.descendant_ids(org_id))
+    return jsonify({"data": SEARCH_INDEX.get().search(query, limit=limit, types=types, scope=scope)})
+
+
+@app.get("/api/skills/match")
+def skill_match():
+    employee_id = request.args.get("employee")
+    position_id = request.args.get("position")
+    if not employee_id or not position_id:
+        return jsonify({"error": "missing_fields"}), 400
+    match = build_skill_match(employee_id, position_id)
+    if match is None:
+        return jsonify({"error": "not_found"}), 404
+    return jsonify({"data": match})
+
+
+@app.get("/api/skills/qualified")
+def skill_qualified():
+    skill_index = SKILL_INDEX.get()
+    candidates = None
+    org_id = request.args.get("org_id")
+    if org_id:
+        if not find_org(org_id):
+            return jsonify({"error": "organization_not_found"}), 404
+        candidates = skill_index.org_candidates(ORG_TREE.descendant_ids(org_id))
+    position_id = request.args.get("position_id")
+    if not position_id:
+        return jsonify({"data": skill_index.qualified_counts(candidates)})
+    if not skill_index.has_position(position_id):
+        return jsonify({"error": "position_not_found"}), 404
+    employees = skill_index.qualified_employees(position_id, candidates)
+    return jsonify({"data": {"position_id": position_id, "count": len(employees), "employees": employees}})
 
 
 @app.get("/api/mock/<resource>")
@@ -484,31 +876,169 @@ def get_mock(resource):
     payload = JOB_FIT_BASE.copy()
     if org_id and org_id in JOB_FIT_BY_ORG:
         payload = {**payload, **JOB_FIT_BY_ORG[org_id]}
+    payload = apply_skill_matches(payload)
+    trend = build_trend_series(org_id or "org_group")
+    if trend:
+        payload["trendSeries"] = trend
     payload["actionSuggestions"] = build_jobfit_action_suggestions(payload, org_id or "org_group")
+    payload = apply_jobfit_snapshot(payload, org_id or "org_group")
     return jsonify({"data": payload})
 
 
+@app.get("/api/jobfit/snapshot")
+def jobfit_snapshot():
+    snapshot = JOBFIT_SNAPSHOT.get()
+    if not snapshot:
+        return jsonify({"error": "snapshot_not_found"}), 404
+    return jsonify({"data": {"run_id": snapshot["run_id"], "generated_at": snapshot["generated_at"]}})
+
+
+def jobfit_capability_gaps(org_id):
+    # Only recomputed gaps are exported; the mock payload's are not per-org data.
+    result = JOBFIT_SNAPSHOT.org_result(org_id)
+    return result["capabilityGaps"] if result else []
+
+
+def export_rows(dataset, org_id=None, start=None, end=None):
+    scope = set(ORG_TREE.descendant_ids(org_id)) if org_id else None
+    if dataset == "matrix":
+        return iter_matrix_rows(EMPLOYEES, POSITIONS, SKILL_INDEX.get(), scope)
+    if dataset == "capability_gaps":
+        org_ids = ORG_TREE.descendant_ids(org_id) if org_id else [org["id"] for org in ORGANIZATIONS]
+        return iter_gap_rows(org_ids, jobfit_capability_gaps)
+    # A copy, since create_action inserts into ACTIONS while a response streams.
+    return iter_action_rows(list(ACTIONS), action_org_id, scope, start, end)
+
+
+@app.get("/api/export/<dataset>")
+def export_dataset(dataset):
+    if dataset not in DATASETS:
+        return jsonify({"error": "dataset_not_found"}), 404
+    fmt = request.args.get("format", "csv")
+    if fmt not in FORMATS:
+        return jsonify({"error": "invalid_format"}), 400
+    org_id = request.args.get("org_id")
+    if org_id and not find_org(org_id):
+        return jsonify({"error": "organization_not_found"}), 404
+    try:
+        start, end = parse_date_range(request.args.get("start"), request.args.get("end"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    if (start or end) and dataset not in DATED_DATASETS:
+        return jsonify({"error": "date_filter_unsupported"}), 400
+    if dataset == "capability_gaps" and not JOBFIT_SNAPSHOT.get():
+        return jsonify({"error": "snapshot_not_found"}), 409
+    rows = export_rows(dataset, org_id, start, end)
+    try:
+        chunks = stream_rows(fmt, dataset, rows)
+    except ValueError:
+        return jsonify({"error": "format_unavailable"}), 400
+    mimetype, extension = FORMATS[fmt]
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename=jobfit-{dataset}.{extension}"},
+    )
+
+
+@app.get("/api/trends")
+def get_trends():
+    org_id = request.args.get("org_id")
+    if not org_id:
+        return jsonify({"error": "missing_org_id"}), 400
+    if not find_org(org_id):
+        return jsonify({"error": "organization_not_found"}), 404
+    metric = request.args.get("metric", TREND_METRIC_JOB_FIT)
+    if metric not in TREND_METRICS:
+        return jsonify({"error": "invalid_metric"}), 400
+    granularity = request.args.get("granularity", "day")
+    if granularity not in GRANULARITIES:
+        return jsonify({"error": "invalid_granularity"}), 400
+    try:
+        points = trend_source(org_id, metric).query(
+            org_id,
+            metric,
+            start=request.args.get("start"),
+            end=request.args.get("end"),
+            granularity=granularity,
+        )
+    except ValueError:
+        return jsonify({"error": "invalid_date"}), 400
+    return jsonify({"data": points})
+
+
+@app.post("/api/trends/ingest")
+def ingest_trends():
+    payload = request.get_json(silent=True) or {}
+    points = payload.get("points")
+    if not isinstance(points, list) or not points:
+        return jsonify({"error": "missing_points"}), 400
+    accepted = 0
+    for point in points:
+        if not isinstance(point, dict):
+            return jsonify({"error": "invalid_point", "accepted": accepted}), 400
+        org_id = point.get("org_id")
+        day = point.get("date")
+        value = point.get("value")
+        metric = point.get("metric", TREND_METRIC_JOB_FIT)
+        if not org_id or not day or value is None:
+            return jsonify({"error": "missing_fields", "accepted": accepted}), 400
+        if not isinstance(org_id, str) or not isinstance(metric, str):
+            return jsonify({"error": "invalid_point", "accepted": accepted}), 400
+        if not find_org(org_id):
+            return jsonify({"error": "organization_not_found", "accepted": accepted}), 400
+        if metric not in TREND_METRICS:
+            return jsonify({"error": "invalid_metric", "accepted": accepted}), 400
+        try:
+            TREND_STORE.append(org_id, metric, day, value)
+        except ValueError as exc:
+            return jsonify({"error": str(exc), "accepted": accepted}), 400
+        accepted += 1
+    return jsonify({"data": {"accepted": accepted}})
+
+
 @app.get("/api/actions")
 def list_actions():
     org_id = request.args.get("org_id")
     if not org_id:
-        return jsonify({"data": ACTIONS})
-    scoped = []
-    for action in ACTIONS:
-        if action["target_object_type"] == "Organization" and action["target_object_id"] == org_id:
-            scoped.append(action)
-            continue
-        if action["target_object_type"] == "Employee":
-            employee = next((emp for emp in EMPLOYEES if emp["id"] == action["target_object_id"]), None)
-            if employee and employee["organization_id"] == org_id:
-                scoped.append(action)
-        if action["target_object_type"] == "Position":
-            position = next((pos for pos in POSITIONS if pos["id"] == action["target_object_id"]), None)
-            if position and position["organization_id"] == org_id:
-                scoped.append(action)
+        return jsonify({"data": list(ACTIONS)})
+    scoped = [action for action in list(ACTIONS) if action_org_id(action) == org_id]
     return jsonify({"data": scoped})
 
 
+def parse_action_query():
+    try:
+        limit = int(request.args.get("limit", "200"))
+    except ValueError:
+        return None, None
+    return max(1, min(limit, ACTION_QUERY_MAX_LIMIT)), request.args.get("org_id") or None
+
+
+@app.get("/api/actions/overdue")
+def list_overdue_actions():
+    limit, org_id = parse_action_query()
+    if limit is None:
+        return jsonify({"error": "invalid_limit"}), 400
+    return jsonify({"data": ACTION_SCHEDULER.overdue(limit=limit, org_id=org_id)})
+
+
+@app.get("/api/actions/upcoming")
+def list_upcoming_actions():
+    limit, org_id = parse_action_query()
+    if limit is None:
+        return jsonify({"error": "invalid_limit"}), 400
+    try:
+        days = int(request.args.get("days", str(REMIND_DAYS)))
+    except ValueError:
+        return jsonify({"error": "invalid_days"}), 400
+    return jsonify({"data": ACTION_SCHEDULER.upcoming(days=max(0, days), limit=limit, org_id=org_id)})
+
+
+@app.get("/api/actions/events")
+def list_action_events():
+    return jsonify({"data": list(ACTION_EVENTS)[::-1]})
+
+
 @app.post("/api/action/update")
 def update_action():
     payload = request.get_json(force=True)
@@ -516,7 +1046,7 @@ def update_action():
     if not action_id:
         return jsonify({"error": "missing_action_id"}), 400
 
-    action = next((item for item in ACTIONS if item["id"] == action_id), None)
+    action = ACTIONS_BY_ID.get(action_id)
     if not action:
         return jsonify({"error": "action_not_found"}), 404
 
@@ -552,6 +1082,7 @@ def update_action():
     if execution_method:
         action["execution_method"] = execution_method
 
+    ACTION_SCHEDULER.upsert(action)
     return jsonify({"data": action})
 
 
@@ -587,17 +1118,17 @@ def simulate_jobfit():
     performance = min(15, match - 70)
     risk = max(5, 30 - (match - 70))
     reason = f"{employee_id} 与 {role_id} 的技能匹配度更高。"
+    result = {
+        "match": match,
+        "performance": performance,
+        "risk": risk,
+        "reason": reason,
+    }
+    skill_match = build_skill_match(employee_id, role_id)
+    if skill_match:
+        result.update(skill_match)
     create_action("Employee", employee_id, "job_transfer", "预计匹配度提升 8%")
-    return jsonify(
-        {
-            "data": {
-                "match": match,
-                "performance": performance,
-                "risk": risk,
-                "reason": reason,
-            }
-        }
-    )
+    return jsonify({"data": result})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,288 @@
+import argparse
+import csv
+import io
+import sys
+from datetime import date
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from recompute import score_employee
+
+CHUNK_ROWS = 5000
+
+DATASETS = {
+    "matrix": [
+        ("employee_id", "string"),
+        ("employee", "string"),
+        ("organization_id", "string"),
+        ("position_id", "string"),
+        ("role", "string"),
+        ("match", "int"),
+        ("level", "string"),
+        ("risk", "string"),
+        ("hard_mismatch", "bool"),
+        ("missing_capabilities", "string"),
+        ("surplus_capabilities", "string"),
+    ],
+    "capability_gaps": [
+        ("organization_id", "string"),
+        ("capability", "string"),
+        ("gap", "int"),
+        ("type", "string"),
+        ("target", "int"),
+        ("current", "int"),
+    ],
+    "actions": [
+        ("id", "string"),
+        ("organization_id", "string"),
+        ("target_object_type", "string"),
+        ("target_object_id", "string"),
+        ("action_type", "string"),
+        ("status", "string"),
+        ("title", "string"),
+        ("expected_impact", "string"),
+        ("effort", "string"),
+        ("execution_method", "string"),
+        ("assignee", "string"),
+        ("due_date", "string"),
+        ("progress", "int"),
+    ],
+}
+
+# Datasets whose rows carry a date that --start/--end filter on.
+DATED_DATASETS = ("actions",)
+
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+
+
+def available_formats():
+    return ["csv"] if pa is None else list(FORMATS)
+
+
+def chunked(rows, size=CHUNK_ROWS):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(columns, rows):
+    names = [name for name, _kind in columns]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so spreadsheet tools detect UTF-8 for Chinese labels.
+    buffer.write("\ufeff")
+    writer.writerow(names)
+    for chunk in chunked(rows):
+        writer.writerows([row.get(name) for name in names] for row in chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    remainder = buffer.getvalue()
+    if remainder:
+        yield remainder.encode("utf-8")
+
+
+def to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+# Row values are stored as given (e.g. progress from /api/action/update), so
+# they are coerced to the column type; a value Arrow rejects would otherwise
+# fail the stream after the response has started.
+COERCE = {
+    "string": lambda value: None if value is None else str(value),
+    "int": to_int,
+    "bool": lambda value: None if value is None else bool(value),
+}
+
+
+def arrow_schema(columns):
+    kinds = {"string": pa.string(), "int": pa.int64(), "bool": pa.bool_()}
+    return pa.schema([(name, kinds[kind]) for name, kind in columns])
+
+
+def arrow_batches(columns, rows):
+    schema = arrow_schema(columns)
+    for chunk in chunked(rows):
+        coerced = [{name: COERCE[kind](row.get(name)) for name, kind in columns} for row in chunk]
+        yield pa.RecordBatch.from_pylist(coerced, schema=schema)
+
+
+class ChunkSink:
+    # Write-only file object that hands bytes back to the caller as they are
+    # produced, while reporting the absolute offset writers rely on.
+    def __init__(self):
+        self.pending = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.pending.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.pending)
+        self.pending = []
+        return data
+
+
+def stream_arrow(columns, rows):
+    sink = ChunkSink()
+    with pa.ipc.new_stream(sink, arrow_schema(columns)) as writer:
+        for batch in arrow_batches(columns, rows):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_parquet(columns, rows):
+    sink = ChunkSink()
+    with pq.ParquetWriter(sink, arrow_schema(columns)) as writer:
+        for batch in arrow_batches(columns, rows):
+            # One row group per chunk keeps writer memory bounded.
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_rows(fmt, dataset, rows):
+    columns = DATASETS[dataset]
+    if fmt == "csv":
+        return stream_csv(columns, rows)
+    if fmt not in available_formats():
+        raise ValueError("format_unavailable")
+    if fmt == "arrow":
+        return stream_arrow(columns, rows)
+    return stream_parquet(columns, rows)
+
+
+def parse_date_range(start=None, end=None):
+    # ISO dates (YYYY-MM-DD) or None; raises ValueError for anything else.
+    try:
+        start = date.fromisoformat(start) if start else None
+        end = date.fromisoformat(end) if end else None
+    except (TypeError, ValueError):
+        raise ValueError("invalid_date") from None
+    if start and end and start > end:
+        raise ValueError("invalid_date_range")
+    return start, end
+
+
+def in_date_range(value, start=None, end=None):
+    if start is None and end is None:
+        return True
+    try:
+        value = date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return False
+    return (start is None or value >= start) and (end is None or value <= end)
+
+
+def iter_matrix_rows(employees, positions, skill_index, scope=None):
+    positions_by_id = {position["id"]: position for position in positions}
+    for employee in employees:
+        if scope is not None and employee["organization_id"] not in scope:
+            continue
+        position = positions_by_id.get(employee["position_id"])
+        if not position or not skill_index.has_employee(employee["id"]):
+            continue
+        comparison = skill_index.compare(employee["id"], position["id"])
+        row = score_employee(employee, position, comparison)
+        yield {
+            "employee_id": employee["id"],
+            "employee": row["employee"],
+            "organization_id": employee["organization_id"],
+            "position_id": position["id"],
+            "role": row["role"],
+            "match": row["match"],
+            "level": row["level"],
+            "risk": row["risk"],
+            "hard_mismatch": comparison["hardMismatch"],
+            "missing_capabilities": "、".join(comparison["missingCapabilities"]),
+            "surplus_capabilities": "、".join(comparison["surplusCapabilities"]),
+        }
+
+
+def iter_gap_rows(org_ids, gaps_for_org):
+    for org_id in org_ids:
+        for gap in gaps_for_org(org_id):
+            yield {"organization_id": org_id, **gap}
+
+
+def iter_action_rows(actions, org_of_action, scope=None, start=None, end=None):
+    for action in actions:
+        org_id = org_of_action(action)
+        if scope is not None and org_id not in scope:
+            continue
+        if not in_date_range(action.get("due_date"), start, end):
+            continue
+        yield {**action, "organization_id": org_id}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export job-fit data in streamed chunks.")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--format", dest="fmt", choices=sorted(FORMATS), default="csv")
+    parser.add_argument("--org-id")
+    parser.add_argument("--start", help="earliest action due date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="latest action due date (YYYY-MM-DD)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    import app
+
+    if args.org_id and not app.find_org(args.org_id):
+        parser.error(f"unknown organization: {args.org_id}")
+    try:
+        start, end = parse_date_range(args.start, args.end)
+    except ValueError:
+        parser.error("--start/--end must be YYYY-MM-DD dates with start <= end")
+    if (start or end) and args.dataset not in DATED_DATASETS:
+        parser.error(f"--start/--end do not apply to the {args.dataset} dataset")
+    if args.dataset == "capability_gaps" and not app.JOBFIT_SNAPSHOT.get():
+        parser.error("capability_gaps export requires a published recompute snapshot")
+    try:
+        chunks = stream_rows(args.fmt, args.dataset, app.export_rows(args.dataset, args.org_id, start, end))
+    except ValueError:
+        parser.error(f"{args.fmt} export requires pyarrow")
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
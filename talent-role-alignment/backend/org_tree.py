@@ -0,0 +1,94 @@
+from collections import deque
+
+MAX_TREE_DEPTH = 5
+
+
+class OrgTreeIndex:
+    # parent -> children index over the flat organization list so tree
+    # endpoints never rescan it; child and descendant counts are computed once.
+    def __init__(self, organizations):
+        self.rebuild(organizations)
+
+    def rebuild(self, organizations):
+        self.by_id = {org["id"]: org for org in organizations}
+        self.children_ids = {org_id: [] for org_id in self.by_id}
+        self.root_ids = []
+        for org in self.by_id.values():
+            parent_id = org.get("parent_id")
+            if parent_id and parent_id in self.by_id:
+                self.children_ids[parent_id].append(org["id"])
+            else:
+                self.root_ids.append(org["id"])
+        self.break_cycles()
+        self.descendant_counts = {}
+        for org_id in self.postorder():
+            self.descendant_counts[org_id] = sum(
+                1 + self.descendant_counts[child_id] for child_id in self.children_ids[org_id]
+            )
+
+    def break_cycles(self):
+        # Orgs not reachable from a root sit on (or under) a parent_id cycle.
+        # The first cycle member met on each walk up is detached and treated
+        # as a root, so every traversal below terminates.
+        reached = set(self.descendant_ids_from(self.root_ids))
+        for org_id in self.by_id:
+            if org_id in reached:
+                continue
+            seen = set()
+            current = org_id
+            while current not in seen:
+                seen.add(current)
+                current = self.by_id[current]["parent_id"]
+            self.children_ids[self.by_id[current]["parent_id"]].remove(current)
+            self.root_ids.append(current)
+            reached.update(self.descendant_ids_from([current]))
+
+    def descendant_ids_from(self, org_ids):
+        ids = []
+        visited = set()
+        queue = deque(org_ids)
+        while queue:
+            org_id = queue.popleft()
+            if org_id in visited:
+                continue
+            visited.add(org_id)
+            ids.append(org_id)
+            queue.extend(self.children_ids.get(org_id, []))
+        return ids
+
+    def postorder(self):
+        order = []
+        stack = list(self.root_ids)
+        while stack:
+            org_id = stack.pop()
+            order.append(org_id)
+            stack.extend(self.children_ids[org_id])
+        return reversed(order)
+
+    def get(self, org_id):
+        return self.by_id.get(org_id)
+
+    def node(self, org_id):
+        return {
+            **self.by_id[org_id],
+            "child_count": len(self.children_ids[org_id]),
+            "descendant_count": self.descendant_counts.get(org_id, 0),
+        }
+
+    def children(self, org_id):
+        return [self.node(child_id) for child_id in self.children_ids.get(org_id, [])]
+
+    def subtree(self, org_id, depth):
+        node = self.node(org_id)
+        if depth > 0:
+            node["children"] = [self.subtree(child_id, depth - 1) for child_id in self.children_ids[org_id]]
+        return node
+
+    def forest(self, depth):
+        return [self.subtree(root_id, depth) for root_id in self.root_ids]
+
+    def descendant_ids(self, org_id, include_self=True):
+        if org_id not in self.by_id:
+            return []
+        ids = self.descendant_ids_from([org_id])
+        return ids if include_self else ids[1:]
@@ -0,0 +1,403 @@
+import argparse
+import fcntl
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import shutil
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from org_tree import OrgTreeIndex
+from skill_index import SkillIndex
+
+DATA_DIR = os.environ.get(
+    "JOBFIT_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "jobfit")
+)
+RUNS_DIR = os.path.join(DATA_DIR, "runs")
+RUN_LOCK_FILE = os.path.join(DATA_DIR, "run.lock")
+SNAPSHOTS_DIR = os.path.join(DATA_DIR, "snapshots")
+CURRENT_FILE = os.path.join(DATA_DIR, "CURRENT")
+
+PARTITION_SIZE = 200
+SNAPSHOT_RETENTION = 3
+MATRIX_LIMIT = 20
+GAP_LIMIT = 6
+KEY_GAP_THRESHOLD = 30
+RISK_LABELS = {"high": "高", "medium": "中", "low": "低"}
+RISK_ORDER = ["低", "中", "高"]
+
+
+def match_level(score):
+    if score >= 80:
+        return "high", "高匹配"
+    if score >= 60:
+        return "medium", "中匹配"
+    return "low", "低匹配"
+
+
+def required_skills(position):
+    return set(position["required_skills"]) | set(position.get("hard_skills") or [])
+
+
+def score_employee(employee, position, comparison):
+    # Match score is the share of the position's required skills the employee holds.
+    required = required_skills(position)
+    missing = comparison["missingCapabilities"]
+    score = round(100 * (len(required) - len(missing)) / len(required)) if required else 100
+    return {
+        "employee": employee.get("name", employee["id"]),
+        "employeeId": employee["id"],
+        "role": position.get("name", position["id"]),
+        "match": score,
+        "level": match_level(score)[1],
+        "risk": RISK_LABELS.get(employee.get("risk_level"), "中"),
+    }
+
+
+def write_json_atomic(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, ensure_ascii=False)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_json(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def partition_org_tree(tree, size=PARTITION_SIZE):
+    # Whole subtrees of at most `size` orgs become one partition; an org whose
+    # subtree is larger is emitted alone and its children are split further.
+    partitions = []
+    stack = list(reversed(tree.root_ids))
+    while stack:
+        org_id = stack.pop()
+        if tree.descendant_counts.get(org_id, 0) + 1 <= size:
+            partitions.append(tree.descendant_ids(org_id))
+        else:
+            partitions.append([org_id])
+            stack.extend(reversed(tree.children_ids[org_id]))
+    return partitions
+
+
+def empty_stats():
+    return {
+        "count": 0,
+        "match_sum": 0,
+        "distribution": {"high": 0, "medium": 0, "low": 0, "hardMismatch": 0},
+        "risk_max": 0,
+        "required": {},
+        "held": {},
+        "rows": [],
+    }
+
+
+WORKER_STATE = {}
+
+
+def init_worker(positions, employees_by_org):
+    WORKER_STATE["positions"] = {position["id"]: position for position in positions}
+    WORKER_STATE["employees_by_org"] = employees_by_org
+
+
+def compute_partition(org_ids):
+    # Direct (non-rolled-up) stats for each org in the partition.
+    positions = WORKER_STATE["positions"]
+    employees_by_org = WORKER_STATE["employees_by_org"]
+    index = SkillIndex()
+    for position in positions.values():
+        index.set_position(position["id"], position["required_skills"], position.get("hard_skills"))
+    index.load_employees(
+        (employee["id"], employee.get("skills", []), org_id)
+        for org_id in org_ids
+        for employee in employees_by_org.get(org_id, [])
+    )
+    results = {}
+    for org_id in org_ids:
+        stats = empty_stats()
+        for employee in employees_by_org.get(org_id, []):
+            position = positions.get(employee["position_id"])
+            if not position:
+                continue
+            comparison = index.compare(employee["id"], position["id"])
+            row = score_employee(employee, position, comparison)
+            missing = set(comparison["missingCapabilities"])
+            stats["count"] += 1
+            stats["match_sum"] += row["match"]
+            stats["distribution"][match_level(row["match"])[0]] += 1
+            if comparison["hardMismatch"]:
+                stats["distribution"]["hardMismatch"] += 1
+            stats["risk_max"] = max(stats["risk_max"], RISK_ORDER.index(row["risk"]))
+            for skill in required_skills(position):
+                stats["required"][skill] = stats["required"].get(skill, 0) + 1
+                if skill not in missing:
+                    stats["held"][skill] = stats["held"].get(skill, 0) + 1
+            stats["rows"].append(row)
+        stats["rows"] = heapq.nsmallest(MATRIX_LIMIT, stats["rows"], key=lambda row: row["match"])
+        results[org_id] = stats
+    return results
+
+
+def merge_stats(target, source):
+    target["count"] += source["count"]
+    target["match_sum"] += source["match_sum"]
+    for key, value in source["distribution"].items():
+        target["distribution"][key] += value
+    target["risk_max"] = max(target["risk_max"], source["risk_max"])
+    for field in ("required", "held"):
+        for skill, value in source[field].items():
+            target[field][skill] = target[field].get(skill, 0) + value
+    target["rows"] = heapq.nsmallest(MATRIX_LIMIT, target["rows"] + source["rows"], key=lambda row: row["match"])
+
+
+def capability_gaps(stats):
+    gaps = []
+    for skill, required in stats["required"].items():
+        current = round(100 * stats["held"].get(skill, 0) / required)
+        gap = 100 - current
+        if gap <= 0:
+            continue
+        gaps.append(
+            {
+                "capability": skill,
+                "gap": gap,
+                "type": "关键差距" if gap >= KEY_GAP_THRESHOLD else "可提升",
+                "target": 100,
+                "current": current,
+            }
+        )
+    gaps.sort(key=lambda item: (-item["gap"], item["capability"]))
+    return gaps[:GAP_LIMIT]
+
+
+def build_org_result(stats, build_suggestions, org_id):
+    avg = round(stats["match_sum"] / stats["count"]) if stats["count"] else 0
+    result = {
+        "summary": {"avgMatch": avg, "level": match_level(avg)[1], "risk": RISK_ORDER[stats["risk_max"]]},
+        "distribution": stats["distribution"],
+        "matrix": [{key: value for key, value in row.items() if key != "employeeId"} for row in stats["rows"]],
+        "capabilityGaps": capability_gaps(stats),
+        "employeeCount": stats["count"],
+    }
+    # Suggestion rules look employees up through singleMatchByEmployee.
+    by_employee = {row["employeeId"]: {"employee": row["employee"]} for row in stats["rows"]}
+    result["actionSuggestions"] = build_suggestions({**result, "singleMatchByEmployee": by_employee}, org_id)
+    return result
+
+
+def dataset_fingerprint(organizations, positions, employees):
+    digest = hashlib.sha256()
+    for table in (organizations, positions, employees):
+        digest.update(b"\0")
+        for record in table:
+            digest.update(json.dumps(record, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def find_resumable_run(fingerprint, log=print):
+    # Checkpoints are only reused for the dataset they were computed from;
+    # unfinished runs over other data are discarded.
+    if not os.path.isdir(RUNS_DIR):
+        return None
+    for run_id in sorted(os.listdir(RUNS_DIR), reverse=True):
+        manifest_path = os.path.join(RUNS_DIR, run_id, "manifest.json")
+        if not os.path.exists(manifest_path):
+            continue
+        manifest = read_json(manifest_path)
+        if manifest.get("fingerprint") == fingerprint:
+            return manifest
+        log(f"discarding run {run_id} created {manifest.get('created_at', '?')}: dataset changed")
+        shutil.rmtree(os.path.join(RUNS_DIR, run_id))
+    return None
+
+
+def publish_snapshot(run_id, results):
+    # A snapshot is a directory: one JSON line per org plus meta.json with
+    # each org's (offset, length), so readers only load the index and decode
+    # the orgs they serve.
+    snapshot_name = f"jobfit-{run_id}"
+    snapshot_dir = os.path.join(SNAPSHOTS_DIR, snapshot_name)
+    tmp_dir = f"{snapshot_dir}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir)
+    offsets = {}
+    with open(os.path.join(tmp_dir, "results.jsonl"), "wb") as handle:
+        for org_id, result in results.items():
+            line = json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n"
+            offsets[org_id] = (handle.tell(), len(line))
+            handle.write(line)
+        handle.flush()
+        os.fsync(handle.fileno())
+    write_json_atomic(
+        os.path.join(tmp_dir, "meta.json"),
+        {"run_id": run_id, "generated_at": datetime.now(timezone.utc).isoformat(), "offsets": offsets},
+    )
+    os.replace(tmp_dir, snapshot_dir)
+    # Readers only ever follow CURRENT, which is swapped in a single rename.
+    tmp_path = f"{CURRENT_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(snapshot_name)
+    os.replace(tmp_path, CURRENT_FILE)
+    published = sorted((name for name in os.listdir(SNAPSHOTS_DIR) if not name.endswith(".tmp")), reverse=True)
+    # Removing a mapped file is safe: readers keep their pages until they swap.
+    for stale in published[SNAPSHOT_RETENTION:]:
+        shutil.rmtree(os.path.join(SNAPSHOTS_DIR, stale))
+    return snapshot_name
+
+
+@contextmanager
+def run_lock():
+    # Held for a whole run, so an overlapping run (e.g. from cron) can never
+    # resume or discard a run directory that is still being computed.
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(RUN_LOCK_FILE, "w") as handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise RuntimeError("run_in_progress") from None
+        yield
+
+
+def run(
+    organizations, positions, employees, build_suggestions, workers=None, resume=True, log=print, fingerprint=None
+):
+    # `fingerprint` identifies the input data (e.g. the data snapshot name);
+    # without one it is hashed from the records.
+    with run_lock():
+        tree = OrgTreeIndex(organizations)
+        fingerprint = fingerprint or dataset_fingerprint(organizations, positions, employees)
+        manifest = find_resumable_run(fingerprint, log) if resume else None
+        if manifest:
+            run_id = manifest["run_id"]
+            log(f"resuming run {run_id} created {manifest['created_at']}")
+        else:
+            now = datetime.now(timezone.utc)
+            run_id = now.strftime("%Y%m%dT%H%M%SZ") + "-" + uuid.uuid4().hex[:6]
+            manifest = {
+                "run_id": run_id,
+                "fingerprint": fingerprint,
+                "created_at": now.isoformat(),
+                "partitions": partition_org_tree(tree),
+            }
+            write_json_atomic(os.path.join(RUNS_DIR, run_id, "manifest.json"), manifest)
+            log(f"starting run {run_id} with {len(manifest['partitions'])} partitions")
+        run_dir = os.path.join(RUNS_DIR, run_id)
+
+        def checkpoint_path(index):
+            return os.path.join(run_dir, f"partition-{index:05d}.json")
+
+        pending = [
+            (index, org_ids)
+            for index, org_ids in enumerate(manifest["partitions"])
+            if not os.path.exists(checkpoint_path(index))
+        ]
+        employees_by_org = {}
+        for employee in employees:
+            employees_by_org.setdefault(employee["organization_id"], []).append(employee)
+
+        if pending:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=init_worker, initargs=(positions, employees_by_org)
+            ) as pool:
+                futures = {pool.submit(compute_partition, org_ids): index for index, org_ids in pending}
+                for future in as_completed(futures):
+                    index = futures[future]
+                    write_json_atomic(checkpoint_path(index), future.result())
+                    log(f"partition {index} done")
+
+        direct = {}
+        for index in range(len(manifest["partitions"])):
+            direct.update(read_json(checkpoint_path(index)))
+
+        results = {}
+        subtree_stats = {}
+        for org_id in tree.postorder():
+            stats = empty_stats()
+            merge_stats(stats, direct.get(org_id, empty_stats()))
+            for child_id in tree.children_ids[org_id]:
+                merge_stats(stats, subtree_stats.pop(child_id))
+            subtree_stats[org_id] = stats
+            results[org_id] = build_org_result(stats, build_suggestions, org_id)
+
+        snapshot_name = publish_snapshot(run_id, results)
+        # A run directory only exists while the run is unfinished.
+        shutil.rmtree(run_dir)
+        log(f"published {snapshot_name}")
+        return snapshot_name
+
+
+class SnapshotReader:
+    # Serving side: follows CURRENT. refresh() loads a newly published
+    # snapshot and swaps it in whole; callers run it off the request path.
+    # Only the org offset index is read up front; org results are decoded on
+    # access from the mapped results file, whose pages workers share.
+    def __init__(self, data_dir=DATA_DIR):
+        self.current_file = os.path.join(data_dir, "CURRENT")
+        self.snapshots_dir = os.path.join(data_dir, "snapshots")
+        self.name = None
+        self.loaded = None
+        self.refresh()
+
+    def refresh(self):
+        try:
+            with open(self.current_file, encoding="utf-8") as handle:
+                name = handle.read().strip()
+        except FileNotFoundError:
+            return
+        if not name or name == self.name:
+            return
+        snapshot_dir = os.path.join(self.snapshots_dir, name)
+        meta = read_json(os.path.join(snapshot_dir, "meta.json"))
+        offsets = meta.pop("offsets")
+        with open(os.path.join(snapshot_dir, "results.jsonl"), "rb") as handle:
+            results = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if offsets else b""
+        self.loaded = (meta, offsets, results)
+        self.name = name
+
+    def get(self):
+        loaded = self.loaded
+        return loaded[0] if loaded else None
+
+    def org_result(self, org_id):
+        loaded = self.loaded
+        if not loaded:
+            return None
+        _meta, offsets, results = loaded
+        if org_id not in offsets:
+            return None
+        offset, length = offsets[org_id]
+        return json.loads(results[offset:offset + length])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute company-wide job-fit results.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--fresh", action="store_true", help="ignore unfinished runs")
+    args = parser.parse_args()
+
+    import app
+
+    try:
+        run(
+            app.ORGANIZATIONS,
+            app.POSITIONS,
+            app.EMPLOYEES,
+            app.build_jobfit_action_suggestions,
+            workers=args.workers,
+            resume=not args.fresh,
+            fingerprint=os.path.basename(app.DATA_SNAPSHOT.path) if app.DATA_SNAPSHOT else None,
+        )
+    except RuntimeError:
+        sys.exit("another recompute run is in progress")
+
+
+if __name__ == "__main__":
+    main()
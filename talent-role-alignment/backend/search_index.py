@@ -0,0 +1,279 @@
+import bisect
+import heapq
+import itertools
+import math
+import re
+import threading
+from functools import lru_cache
+
+from pypinyin import Style, lazy_pinyin
+
+MAX_PREFIX = 12
+# Scoring one scoped document (name plus context lookups) costs about this
+# many posting reads; used to choose between scanning a scope and walking.
+SCAN_COST = 16
+# Scopes this small are always scanned: at most a couple of ms, while a walk
+# may also read every member of each matching org or position.
+SCAN_FLOOR = 128
+
+# Match tiers, best first. Name matches always outrank org/role context.
+TIER_NAME = 0
+TIER_NAME_PINYIN = 1
+TIER_NAME_INITIALS = 2
+TIER_NAME_INFIX = 3
+TIER_CONTEXT = 4
+TIER_CONTEXT_INFIX = 5
+
+CJK_RE = re.compile(r"[一-鿿]")
+
+
+def normalize(text):
+    return re.sub(r"\s+", "", (text or "").lower())
+
+
+@lru_cache(maxsize=65536)
+def field_terms(text):
+    # (term, kind) pairs for one searchable field. Chinese text also gets
+    # full pinyin, initials, and its suffixes so "销售" finds "北区销售部".
+    # Cached because org and role names repeat across most documents.
+    text = normalize(text)
+    if not text:
+        return ()
+    terms = [(text, "text")]
+    if CJK_RE.search(text):
+        terms.append(("".join(lazy_pinyin(text)), "pinyin"))
+        terms.append(("".join(lazy_pinyin(text, style=Style.FIRST_LETTER)), "initials"))
+        terms.extend((text[start:], "infix") for start in range(1, len(text)))
+    return tuple(terms)
+
+
+NAME_TIERS = {
+    "text": TIER_NAME,
+    "pinyin": TIER_NAME_PINYIN,
+    "initials": TIER_NAME_INITIALS,
+    "infix": TIER_NAME_INFIX,
+}
+
+
+def context_tier(tier):
+    return TIER_CONTEXT_INFIX if tier == TIER_NAME_INFIX else TIER_CONTEXT
+
+
+def name_tier(terms, query):
+    tiers = [NAME_TIERS[kind] for term, kind in terms if term.startswith(query)]
+    return min(tiers, default=None)
+
+
+class SearchIndex:
+    # Prefix index over document names. Each document type has its own
+    # posting map; each prefix (up to MAX_PREFIX chars) maps to one list per
+    # name tier, kept ordered by (name length, name), so top-N is read off the
+    # front of the lists instead of scoring every candidate. Org and role
+    # context is not expanded per document: a document links to its context
+    # documents (an employee to its org and position) and context matches are
+    # joined through `members`, keyed by (member type, context key), at query
+    # time. Inserts append and mark the list dirty; it is re-sorted on next
+    # read, which keeps bulk loads linear.
+    def __init__(self):
+        self.postings = {}
+        self.members = {}
+        self.context_types = {}
+        self.dirty = set()
+        self.documents = {}
+        self.ranks = {}
+        self.by_org = {}
+        self.lock = threading.Lock()
+
+    def upsert(self, doc_type, doc_id, name, context=(), **extra):
+        key = (doc_type, doc_id)
+        terms = field_terms(name)
+        document = {"type": doc_type, "id": doc_id, "name": name, **extra, "terms": terms, "context": tuple(context)}
+        rank = (len(name), name, doc_type, doc_id)
+        with self.lock:
+            self.unlink(key)
+            self.documents[key] = document
+            self.ranks[key] = rank
+            postings = self.postings.setdefault(doc_type, {})
+            for prefix, tier in self.name_entries(terms).items():
+                tiers = postings.get(prefix)
+                if tiers is None:
+                    tiers = postings[prefix] = [[] for _ in range(TIER_CONTEXT)]
+                tiers[tier].append(rank)
+                self.dirty.add((doc_type, prefix, tier))
+            for context_key in document["context"]:
+                self.members.setdefault((doc_type, context_key), []).append(rank)
+                self.dirty.add((doc_type, context_key))
+                self.context_types.setdefault(doc_type, set()).add(context_key[0])
+            org_id = extra.get("organization_id")
+            if org_id is not None:
+                self.by_org.setdefault((doc_type, org_id), set()).add(doc_id)
+
+    def remove(self, doc_type, doc_id):
+        with self.lock:
+            self.unlink((doc_type, doc_id))
+
+    def name_entries(self, terms):
+        # Best name tier per prefix of the document's terms.
+        entries = {}
+        for term, kind in terms:
+            tier = NAME_TIERS[kind]
+            for length in range(1, min(len(term), MAX_PREFIX) + 1):
+                prefix = term[:length]
+                if entries.get(prefix, TIER_CONTEXT) > tier:
+                    entries[prefix] = tier
+        return entries
+
+    def discard_rank(self, ranks, rank, dirty_key):
+        if dirty_key in self.dirty:
+            ranks.remove(rank)
+        else:
+            del ranks[bisect.bisect_left(ranks, rank)]
+
+    def unlink(self, key):
+        document = self.documents.pop(key, None)
+        if document is None:
+            return
+        rank = self.ranks.pop(key)
+        doc_type = key[0]
+        postings = self.postings[doc_type]
+        for prefix, tier in self.name_entries(document["terms"]).items():
+            tiers = postings[prefix]
+            self.discard_rank(tiers[tier], rank, (doc_type, prefix, tier))
+            if not any(tiers):
+                del postings[prefix]
+                for index in range(TIER_CONTEXT):
+                    self.dirty.discard((doc_type, prefix, index))
+        for context_key in document["context"]:
+            members_key = (doc_type, context_key)
+            members = self.members[members_key]
+            self.discard_rank(members, rank, members_key)
+            if not members:
+                del self.members[members_key]
+                self.dirty.discard(members_key)
+        org_id = document.get("organization_id")
+        if org_id is not None:
+            ids = self.by_org[(doc_type, org_id)]
+            ids.discard(key[1])
+            if not ids:
+                del self.by_org[(doc_type, org_id)]
+
+    def ordered(self, doc_type, prefix, tier):
+        ranks = self.postings[doc_type][prefix][tier]
+        if (doc_type, prefix, tier) in self.dirty:
+            ranks.sort()
+            self.dirty.discard((doc_type, prefix, tier))
+        return ranks
+
+    def ordered_members(self, doc_type, context_key):
+        members_key = (doc_type, context_key)
+        ranks = self.members.get(members_key, [])
+        if members_key in self.dirty:
+            ranks.sort()
+            self.dirty.discard(members_key)
+        return ranks
+
+    def tier_ranks(self, prefix, tier, types):
+        # One name tier across the given document types, in rank order.
+        lists = [
+            self.ordered(doc_type, prefix, tier)
+            for doc_type in types
+            if prefix in self.postings.get(doc_type, {}) and self.postings[doc_type][prefix][tier]
+        ]
+        return lists[0] if len(lists) == 1 else heapq.merge(*lists)
+
+    def document_order(self, key, query):
+        # Sort key of a matching document, or None: the order walk() yields
+        # it in, i.e. context matches follow their best context's rank.
+        document = self.documents[key]
+        tier = name_tier(document["terms"], query)
+        if tier is not None:
+            return (tier, (), self.ranks[key])
+        orders = []
+        for context_key in document["context"]:
+            context = self.documents.get(context_key)
+            context_match = name_tier(context["terms"], query) if context else None
+            if context_match is not None:
+                orders.append((context_tier(context_match), self.ranks[context_key], self.ranks[key]))
+        return min(orders, default=None)
+
+    def walk(self, query, types, scope):
+        # Name tiers first, then documents whose context matched, both in
+        # rank order; long queries are verified against the stored terms
+        # since prefixes are capped at MAX_PREFIX.
+        prefix = query[:MAX_PREFIX]
+        long_query = len(query) > MAX_PREFIX
+        seen = set()
+
+        def accept(key):
+            if key in seen or key[0] not in types:
+                return False
+            if scope is not None and self.documents[key].get("organization_id") not in scope:
+                return False
+            seen.add(key)
+            return True
+
+        for tier in range(TIER_CONTEXT):
+            for rank in self.tier_ranks(prefix, tier, types):
+                key = rank[2:]
+                if long_query and name_tier(self.documents[key]["terms"], query) is None:
+                    continue
+                if accept(key):
+                    yield key
+        # Only document types that are context of a requested type are read,
+        # and only their members of the requested types.
+        context_types = set().union(*(self.context_types.get(doc_type, ()) for doc_type in types))
+        for tiers in ((TIER_NAME, TIER_NAME_PINYIN, TIER_NAME_INITIALS), (TIER_NAME_INFIX,)):
+            context_ranks = heapq.merge(*(self.tier_ranks(prefix, tier, context_types) for tier in tiers))
+            for context_rank in context_ranks:
+                context_key = context_rank[2:]
+                if long_query and name_tier(self.documents[context_key]["terms"], query) is None:
+                    continue
+                members = [self.ordered_members(doc_type, context_key) for doc_type in types]
+                for rank in heapq.merge(*members) if len(members) > 1 else members[0]:
+                    if accept(rank[2:]):
+                        yield rank[2:]
+
+    def scope_keys(self, types, scope, budget):
+        # Documents inside the scope, or None once there are more than
+        # `budget` of them and walking the postings is the cheaper plan.
+        if len(scope) > budget:
+            return None
+        groups = []
+        size = 0
+        for org_id in scope:
+            for doc_type in types:
+                ids = self.by_org.get((doc_type, org_id))
+                if ids:
+                    groups.append((doc_type, ids))
+                    size += len(ids)
+                    if size > budget:
+                        return None
+        return [(doc_type, doc_id) for doc_type, ids in groups for doc_id in ids]
+
+    def search(self, query, limit=10, types=None, scope=None):
+        query = normalize(query)
+        if not query:
+            return []
+        prefix = query[:MAX_PREFIX]
+        with self.lock:
+            types = tuple(types or self.postings)
+            keys = None
+            if scope is not None:
+                # A walk reads at most every posting, and stops after about
+                # limit * documents / scope-size reads when hits are spread
+                # evenly. Scanning n documents costs n * SCAN_COST, so scan
+                # only while n is below both break-even points (or SCAN_FLOOR).
+                reads = sum(len(ranks) for postings in self.postings.values() for ranks in postings.get(prefix, ()))
+                budget = max(
+                    SCAN_FLOOR, min(reads // SCAN_COST, math.isqrt(limit * len(self.documents) // SCAN_COST))
+                )
+                keys = self.scope_keys(types, scope, budget)
+            if keys is None:
+                results = list(itertools.islice(self.walk(query, types, scope), limit))
+            else:
+                hits = [order for order in (self.document_order(key, query) for key in keys) if order]
+                results = [order[2][2:] for order in heapq.nsmallest(limit, hits)]
+            return [
+                {field: value for field, value in self.documents[key].items() if field not in ("terms", "context")}
+                for key in results
+            ]
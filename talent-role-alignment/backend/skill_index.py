@@ -0,0 +1,212 @@
+import threading
+
+
+class SkillVocabulary:
+    # Interns capability names to bit positions; a skill set is a Python int.
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def intern(self, skill):
+        skill_id = self.ids.get(skill)
+        if skill_id is None:
+            skill_id = self.ids[skill] = len(self.names)
+            self.names.append(skill)
+        return skill_id
+
+    def mask(self, skills):
+        result = 0
+        for skill in skills:
+            result |= 1 << self.intern(skill)
+        return result
+
+    def decode(self, mask):
+        return [self.names[skill_id] for skill_id in iter_bits(mask)]
+
+
+def iter_bits(mask):
+    # Scans the binary string rather than peeling low bits, which would copy
+    # a company-wide employee bitset once per set bit.
+    bits = bin(mask)[:1:-1]
+    index = bits.find("1")
+    while index != -1:
+        yield index
+        index = bits.find("1", index + 1)
+
+
+def union_ranges(entries):
+    # ORs (base, mask) bitsets, each relative to its lowest slot `base`.
+    # Sorted by base and merged pairwise, so every shift spans only the
+    # slots between two neighbours instead of the full employee range.
+    entries = sorted(entries)
+    while len(entries) > 1:
+        merged = [
+            (base, mask | other_mask << (other_base - base))
+            for (base, mask), (other_base, other_mask) in zip(entries[::2], entries[1::2])
+        ]
+        if len(entries) % 2:
+            merged.append(entries[-1])
+        entries = merged
+    if not entries:
+        return 0
+    base, mask = entries[0]
+    return mask << base
+
+
+class SkillIndex:
+    # Row view: one skill mask per employee and per position, for
+    # missing/surplus/hard-mismatch of a single pair. Column view: one bitset
+    # of employee slots per skill, so the employees meeting every hard
+    # requirement of a position are the AND of a few big ints. Org view: one
+    # (base, mask) slot bitset per org; bulk loads give each org a contiguous
+    # slot run, so these stay small and an org subtree is a cheap union.
+    def __init__(self):
+        self.vocab = SkillVocabulary()
+        self.employee_slots = {}
+        self.slot_employees = []
+        self.slot_orgs = []
+        self.org_slots = {}
+        self.employee_masks = []
+        self.active = 0
+        self.holders = []
+        self.positions = {}
+        self.lock = threading.Lock()
+
+    def set_employee(self, employee_id, skills, org_id=None):
+        mask = self.vocab.mask(skills)
+        with self.lock:
+            slot = self.employee_slots.get(employee_id)
+            if slot is None:
+                slot = self.employee_slots[employee_id] = len(self.slot_employees)
+                self.slot_employees.append(employee_id)
+                self.slot_orgs.append(None)
+                self.employee_masks.append(0)
+            self.move_org(slot, org_id)
+            self.update_holders(slot, self.employee_masks[slot], mask)
+            self.employee_masks[slot] = mask
+            self.active |= 1 << slot
+
+    def load_employees(self, employees):
+        # Bulk path for (employee_id, skills, org_id) rows: column bits are set
+        # in one bytearray per skill and converted to ints once, instead of
+        # OR-ing a single bit into company-wide ints per row. New rows get
+        # slots grouped by org. Known ids are updated through set_employee.
+        rows = {}
+        for employee_id, skills, org_id in employees:
+            if employee_id in self.employee_slots:
+                self.set_employee(employee_id, skills, org_id)
+            else:
+                rows[employee_id] = (self.vocab.mask(skills), org_id)
+        rows = sorted(rows.items(), key=lambda item: item[1][1] or "")
+        with self.lock:
+            start = len(self.slot_employees)
+            size = (start + len(rows) + 7) // 8
+            columns = [bytearray(size) for _name in self.vocab.names]
+            active = bytearray(size)
+            runs = {}
+            for slot, (employee_id, (mask, org_id)) in enumerate(rows, start):
+                byte, bit = slot >> 3, 1 << (slot & 7)
+                for skill_id in iter_bits(mask):
+                    columns[skill_id][byte] |= bit
+                active[byte] |= bit
+                self.employee_slots[employee_id] = slot
+                self.slot_employees.append(employee_id)
+                self.slot_orgs.append(org_id)
+                self.employee_masks.append(mask)
+                if org_id is not None:
+                    run_start, count = runs.get(org_id, (slot, 0))
+                    runs[org_id] = (run_start, count + 1)
+            for org_id, (run_start, count) in runs.items():
+                self.merge_org(org_id, run_start, (1 << count) - 1)
+            while len(self.holders) < len(columns):
+                self.holders.append(0)
+            for skill_id, column in enumerate(columns):
+                self.holders[skill_id] |= int.from_bytes(column, "little")
+            self.active |= int.from_bytes(active, "little")
+
+    def remove_employee(self, employee_id):
+        with self.lock:
+            slot = self.employee_slots.get(employee_id)
+            if slot is None:
+                return
+            self.update_holders(slot, self.employee_masks[slot], 0)
+            self.move_org(slot, None)
+            self.employee_masks[slot] = 0
+            self.active &= ~(1 << slot)
+
+    def merge_org(self, org_id, base, mask):
+        current = self.org_slots.get(org_id)
+        if current is not None:
+            (base, mask), (other_base, other_mask) = sorted([current, (base, mask)])
+            mask |= other_mask << (other_base - base)
+        self.org_slots[org_id] = (base, mask)
+
+    def move_org(self, slot, org_id):
+        previous = self.slot_orgs[slot]
+        if previous == org_id:
+            return
+        if previous is not None:
+            base, mask = self.org_slots[previous]
+            mask &= ~(1 << (slot - base))
+            if mask:
+                self.org_slots[previous] = (base, mask)
+            else:
+                del self.org_slots[previous]
+        self.slot_orgs[slot] = org_id
+        if org_id is not None:
+            self.merge_org(org_id, slot, 1)
+
+    def update_holders(self, slot, old_mask, new_mask):
+        bit = 1 << slot
+        while len(self.holders) < len(self.vocab.names):
+            self.holders.append(0)
+        for skill_id in iter_bits(old_mask & ~new_mask):
+            self.holders[skill_id] &= ~bit
+        for skill_id in iter_bits(new_mask & ~old_mask):
+            self.holders[skill_id] |= bit
+
+    def set_position(self, position_id, required_skills, hard_skills=None):
+        required = self.vocab.mask(required_skills)
+        hard = self.vocab.mask(hard_skills) if hard_skills is not None else required
+        with self.lock:
+            self.positions[position_id] = (required | hard, hard)
+
+    def has_employee(self, employee_id):
+        return employee_id in self.employee_slots
+
+    def has_position(self, position_id):
+        return position_id in self.positions
+
+    def compare(self, employee_id, position_id):
+        mask = self.employee_masks[self.employee_slots[employee_id]]
+        required, hard = self.positions[position_id]
+        return {
+            "hardMismatch": bool(hard & ~mask),
+            "missingCapabilities": self.vocab.decode(required & ~mask),
+            "surplusCapabilities": self.vocab.decode(mask & ~required),
+        }
+
+    def qualified_slots(self, position_id, candidates=None):
+        _required, hard = self.positions[position_id]
+        with self.lock:
+            result = self.active if candidates is None else self.active & candidates
+            for skill_id in iter_bits(hard):
+                if not result:
+                    break
+                result &= self.holders[skill_id] if skill_id < len(self.holders) else 0
+        return result
+
+    def org_candidates(self, org_ids):
+        # Slot bitset of the employees in any of `org_ids`.
+        with self.lock:
+            entries = [self.org_slots[org_id] for org_id in org_ids if org_id in self.org_slots]
+        return union_ranges(entries)
+
+    def qualified_employees(self, position_id, candidates=None):
+        return [self.slot_employees[slot] for slot in iter_bits(self.qualified_slots(position_id, candidates))]
+
+    def qualified_counts(self, candidates=None):
+        return {
+            position_id: self.qualified_slots(position_id, candidates).bit_count()
+            for position_id in self.positions
+        }
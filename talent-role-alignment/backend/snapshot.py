@@ -0,0 +1,315 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+MAGIC = b"DIPSNAP\0"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sII")
+SECTION = struct.Struct("<48sQQ")
+ALIGNMENT = 8
+
+SNAPSHOT_DIR = os.environ.get(
+    "DIP_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "snapshots")
+)
+SNAPSHOT_RETENTION = 3
+
+# Field types: "string" and "string_list" are dictionary-encoded into int32
+# codes over a per-field string table; numeric fields are plain columns. A
+# string_list column also stores one null flag per row, so None and [] stay
+# distinct.
+TYPECODES = {"int32": "i", "float64": "d"}
+
+TABLE_FIELDS = {
+    "organizations": [
+        ("id", "string"),
+        ("name", "string"),
+        ("parent_id", "string"),
+        ("level", "string"),
+        ("metrics.roi", "float64"),
+        ("metrics.health_score", "float64"),
+        ("metrics.job_fit", "float64"),
+    ],
+    "positions": [
+        ("id", "string"),
+        ("name", "string"),
+        ("organization_id", "string"),
+        ("required_skills", "string_list"),
+        ("hard_skills", "string_list"),
+    ],
+    "employees": [
+        ("id", "string"),
+        ("name", "string"),
+        ("organization_id", "string"),
+        ("position_id", "string"),
+        ("risk_level", "string"),
+        ("skills", "string_list"),
+    ],
+}
+
+
+def get_path(record, name):
+    value = record
+    for part in name.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def set_path(record, name, value):
+    # `name` is a dotted field name or its pre-split parts.
+    parts = name.split(".") if isinstance(name, str) else name
+    for part in parts[:-1]:
+        record = record.setdefault(part, {})
+    record[parts[-1]] = value
+
+
+class SnapshotWriter:
+    def __init__(self):
+        self.sections = []
+        self.schema = {}
+
+    def add_array(self, name, typecode, values):
+        self.sections.append((name, array(typecode, values).tobytes()))
+
+    def add_bytes(self, name, data):
+        self.sections.append((name, data))
+
+    def add_string_table(self, name, values):
+        # Offsets are int64 so one table may exceed 2 GiB of UTF-8.
+        offsets = array("q", [0])
+        chunks = []
+        total = 0
+        for value in values:
+            encoded = value.encode("utf-8")
+            chunks.append(encoded)
+            total += len(encoded)
+            offsets.append(total)
+        self.add_array(f"{name}.offsets", "q", offsets)
+        self.add_bytes(f"{name}.data", b"".join(chunks))
+
+    def add_table(self, table, fields, records):
+        records = list(records)
+        for field, kind in fields:
+            column = f"{table}.{field}"
+            if kind in TYPECODES:
+                # NaN marks a missing float; int columns default to 0.
+                default = float("nan") if kind == "float64" else 0
+                values = [get_path(record, field) for record in records]
+                self.add_array(column, TYPECODES[kind], [default if value is None else value for value in values])
+                continue
+            dictionary = {}
+            if kind == "string":
+                codes = [self.encode(dictionary, get_path(record, field)) for record in records]
+            else:
+                offsets = [0]
+                nulls = bytearray(len(records))
+                codes = []
+                for row, record in enumerate(records):
+                    values = get_path(record, field)
+                    if values is None:
+                        nulls[row] = 1
+                    codes.extend(self.encode(dictionary, value) for value in values or [])
+                    offsets.append(len(codes))
+                self.add_array(f"{column}.offsets", "q", offsets)
+                self.add_bytes(f"{column}.nulls", bytes(nulls))
+            self.add_array(f"{column}.codes", "i", codes)
+            self.add_string_table(f"{column}.dict", list(dictionary))
+        self.schema[table] = {"rows": len(records), "fields": [list(item) for item in fields]}
+
+    def encode(self, dictionary, value):
+        # Code -1 encodes None so nullable references survive the round trip.
+        if value is None:
+            return -1
+        code = dictionary.get(value)
+        if code is None:
+            code = dictionary[value] = len(dictionary)
+        return code
+
+    def write(self, path, metadata=None):
+        schema = json.dumps({"tables": self.schema, "metadata": metadata or {}}, ensure_ascii=False).encode("utf-8")
+        sections = [("schema", schema)] + self.sections
+        offset = HEADER.size + SECTION.size * len(sections)
+        layout = []
+        for name, data in sections:
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            layout.append((name, offset, data))
+            offset += len(data)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(sections)))
+            for name, section_offset, data in layout:
+                handle.write(SECTION.pack(name.encode("utf-8"), section_offset, len(data)))
+            for _name, section_offset, data in layout:
+                handle.write(b"\0" * (section_offset - handle.tell()))
+                handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+
+
+class StringTable(Sequence):
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return str(self.data[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+
+
+class RecordTable(Sequence):
+    # Read-only list of dicts decoded on access from mmap-backed columns, so
+    # opening a snapshot costs nothing per row and pages are shared between
+    # worker processes mapping the same file.
+    def __init__(self, snapshot, table, rows, fields):
+        self.rows = rows
+        self.readers = []
+        for field, kind in fields:
+            column = f"{table}.{field}"
+            if kind in TYPECODES:
+                values = snapshot.array(column, TYPECODES[kind])
+                self.readers.append((tuple(field.split(".")), kind, values, None, None))
+                continue
+            codes = snapshot.array(f"{column}.codes", "i")
+            dictionary = snapshot.strings(f"{column}.dict")
+            if kind == "string_list":
+                offsets = (snapshot.array(f"{column}.offsets", "q"), snapshot.section(f"{column}.nulls"))
+            else:
+                offsets = None
+            self.readers.append((tuple(field.split(".")), kind, codes, dictionary, offsets))
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[item] for item in range(*index.indices(self.rows))]
+        if index < 0:
+            index += self.rows
+        if not 0 <= index < self.rows:
+            raise IndexError(index)
+        record = {}
+        for field, kind, values, dictionary, offsets in self.readers:
+            if kind == "float64":
+                value = values[index]
+                set_path(record, field, None if value != value else value)
+            elif kind == "int32":
+                set_path(record, field, values[index])
+            elif kind == "string":
+                code = values[index]
+                set_path(record, field, dictionary[code] if code >= 0 else None)
+            else:
+                starts, nulls = offsets
+                if nulls[index]:
+                    set_path(record, field, None)
+                    continue
+                codes = values[starts[index]:starts[index + 1]]
+                set_path(record, field, [dictionary[code] for code in codes])
+        return record
+
+    def row_index(self, field):
+        # value -> row for a unique string column, read from the codes and
+        # string table without decoding whole records.
+        for parts, kind, codes, dictionary, _offsets in self.readers:
+            if ".".join(parts) == field and kind == "string":
+                return {dictionary[code]: row for row, code in enumerate(codes) if code >= 0}
+        raise KeyError(field)
+
+
+class Snapshot:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as handle:
+            self.mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mmap)
+        magic, version, count = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC:
+            raise ValueError("invalid_snapshot")
+        if version != FORMAT_VERSION:
+            raise ValueError("unsupported_snapshot_version")
+        self.sections = {}
+        for index in range(count):
+            name, offset, length = SECTION.unpack_from(self.mmap, HEADER.size + SECTION.size * index)
+            self.sections[name.rstrip(b"\0").decode("utf-8")] = (offset, length)
+        schema = json.loads(bytes(self.section("schema")))
+        self.metadata = schema["metadata"]
+        self.schema = schema["tables"]
+
+    def section(self, name):
+        offset, length = self.sections[name]
+        return self.view[offset:offset + length]
+
+    def array(self, name, typecode):
+        return self.section(name).cast(typecode)
+
+    def strings(self, name):
+        return StringTable(self.array(f"{name}.offsets", "q"), self.section(f"{name}.data"))
+
+    def table(self, name):
+        spec = self.schema[name]
+        return RecordTable(self, name, spec["rows"], [tuple(item) for item in spec["fields"]])
+
+
+def write_snapshot(path, tables, metadata=None):
+    writer = SnapshotWriter()
+    for table, records in tables.items():
+        writer.add_table(table, TABLE_FIELDS[table], records)
+    writer.write(path, metadata)
+
+
+def publish(tables, snapshot_dir=SNAPSHOT_DIR):
+    os.makedirs(snapshot_dir, exist_ok=True)
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    name = f"snapshot-{version}.dipsnap"
+    write_snapshot(os.path.join(snapshot_dir, name), tables, {"version": version})
+    # Workers follow CURRENT; replacing it is the atomic switch-over.
+    current = os.path.join(snapshot_dir, "CURRENT")
+    tmp_path = f"{current}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(name)
+    os.replace(tmp_path, current)
+    snapshots = sorted(item for item in os.listdir(snapshot_dir) if item.endswith(".dipsnap"))
+    # Unlinking a mapped file is safe: workers keep their pages until they remap.
+    for stale in snapshots[:-SNAPSHOT_RETENTION]:
+        os.remove(os.path.join(snapshot_dir, stale))
+    return name
+
+
+def current_name(snapshot_dir=SNAPSHOT_DIR):
+    try:
+        with open(os.path.join(snapshot_dir, "CURRENT"), encoding="utf-8") as handle:
+            return handle.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def open_current(snapshot_dir=SNAPSHOT_DIR):
+    name = current_name(snapshot_dir)
+    if not name:
+        return None
+    return Snapshot(os.path.join(snapshot_dir, name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and publish a memory-mapped data snapshot.")
+    parser.add_argument("--dir", default=SNAPSHOT_DIR)
+    args = parser.parse_args()
+
+    import app
+
+    name = publish(
+        {"organizations": app.ORGANIZATIONS, "positions": app.POSITIONS, "employees": app.EMPLOYEES},
+        args.dir,
+    )
+    print(f"published {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import math
+import threading
+from array import array
+from datetime import date, timedelta
+
+GRANULARITIES = ("day", "week", "month")
+# Accepted ingest window relative to today; bounds the dense gap padding.
+MAX_HISTORY_DAYS = 366 * 20
+MAX_FUTURE_DAYS = 1
+
+
+def to_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def week_key(day):
+    # Monday-aligned: ordinal 1 (0001-01-01) is a Monday.
+    return (day.toordinal() - 1) // 7
+
+
+def month_key(day):
+    return day.year * 12 + day.month - 1
+
+
+def bucket_key(day, granularity):
+    if granularity == "day":
+        return day.toordinal()
+    if granularity == "week":
+        return week_key(day)
+    return month_key(day)
+
+
+def bucket_start(key, granularity):
+    if granularity == "day":
+        return date.fromordinal(key)
+    if granularity == "week":
+        return date.fromordinal(key * 7 + 1)
+    return date(key // 12, key % 12 + 1, 1)
+
+
+class Rollup:
+    # Dense per-bucket sum/count arrays starting at `origin`; avg = sum / count.
+    def __init__(self, origin):
+        self.origin = origin
+        self.sums = array("d")
+        self.counts = array("I")
+
+    def add(self, key, value):
+        index = key - self.origin
+        while len(self.sums) <= index:
+            self.sums.append(0.0)
+            self.counts.append(0)
+        self.sums[index] += value
+        self.counts[index] += 1
+
+    def slice(self, start_key, end_key):
+        lo = max(start_key - self.origin, 0)
+        hi = min(end_key - self.origin + 1, len(self.sums))
+        return [
+            (self.origin + index, total / count)
+            for index, total, count in zip(range(lo, hi), self.sums[lo:hi], self.counts[lo:hi])
+            if count
+        ]
+
+
+class Series:
+    # Daily values are stored densely from the first ingested day as float32,
+    # with NaN marking days that were skipped. Week and month rollups are
+    # maintained on every append so range queries never rescan daily data.
+    def __init__(self, first_day):
+        self.origin = first_day.toordinal()
+        self.values = array("f")
+        self.week = Rollup(week_key(first_day))
+        self.month = Rollup(month_key(first_day))
+
+    @property
+    def last_ordinal(self):
+        return self.origin + len(self.values) - 1
+
+    def append(self, day, value):
+        ordinal = day.toordinal()
+        if self.values and ordinal <= self.last_ordinal:
+            raise ValueError("out_of_order")
+        while self.origin + len(self.values) < ordinal:
+            self.values.append(math.nan)
+        self.values.append(value)
+        self.week.add(week_key(day), value)
+        self.month.add(month_key(day), value)
+
+    def days(self, start_ordinal, end_ordinal):
+        lo = max(start_ordinal - self.origin, 0)
+        hi = min(end_ordinal - self.origin + 1, len(self.values))
+        # NaN != NaN, so the comparison drops skipped days without a call per item.
+        return [
+            (self.origin + index, value)
+            for index, value in zip(range(lo, hi), self.values[lo:hi])
+            if value == value
+        ]
+
+    def query(self, start, end, granularity):
+        start_key = bucket_key(start, granularity)
+        end_key = bucket_key(end, granularity)
+        if granularity == "day":
+            return self.days(start_key, end_key)
+        if granularity == "week":
+            return self.week.slice(start_key, end_key)
+        return self.month.slice(start_key, end_key)
+
+
+class TrendStore:
+    def __init__(self):
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def append(self, org_id, metric, day, value, today=None):
+        try:
+            day = to_date(day)
+        except (TypeError, ValueError):
+            raise ValueError("invalid_date") from None
+        today = (today or date.today()).toordinal()
+        if not today - MAX_HISTORY_DAYS <= day.toordinal() <= today + MAX_FUTURE_DAYS:
+            raise ValueError("out_of_range")
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError("invalid_value")
+        with self.lock:
+            series = self.series.get((org_id, metric))
+            if series is None:
+                series = self.series[(org_id, metric)] = Series(day)
+            series.append(day, float(value))
+
+    def has_series(self, org_id, metric):
+        return (org_id, metric) in self.series
+
+    def query(self, org_id, metric, start=None, end=None, granularity="day"):
+        if granularity not in GRANULARITIES:
+            raise ValueError("invalid_granularity")
+        series = self.series.get((org_id, metric))
+        if series is None:
+            return []
+        start = to_date(start) if start else date.fromordinal(series.origin)
+        end = to_date(end) if end else date.fromordinal(series.last_ordinal)
+        if start > end:
+            return []
+        return [
+            {"period": bucket_start(key, granularity).isoformat(), "score": round(value, 2)}
+            for key, value in series.query(start, end, granularity)
+        ]
+
+
+def recent_month_starts(count, today=None):
+    today = today or date.today()
+    key = month_key(today)
+    return [bucket_start(key - offset, "month") for offset in range(count - 1, -1, -1)]
+
+
+def seed_from_monthly(store, org_id, metric, monthly_scores, today=None):
+    # Expands a legacy six-month trend list into daily points ending today.
+    today = today or date.today()
+    for month_start, score in zip(recent_month_starts(len(monthly_scores), today), monthly_scores):
+        day = month_start
+        while day.month == month_start.month and day <= today:
+            store.append(org_id, metric, day, score)
+            day += timedelta(days=1)
@@ -1,4 +1,4 @@
-import type { Organization } from './context/OrganizationContext';
+import type { Organization, OrganizationNode } from './context/OrganizationContext';
 
 export type ApiResult<T> = {
   data: T;
@@ -27,11 +27,47 @@ export function getOrganizations() {
   return request<ApiResult<Organization[]>>('/api/organizations');
 }
 
+export function getOrganizationTree(params: { root_id?: string; depth?: number } = {}) {
+  const query = new URLSearchParams();
+  if (params.root_id) query.set('root_id', params.root_id);
+  if (params.depth !== undefined) query.set('depth', String(params.depth));
+  return request<ApiResult<OrganizationNode[]>>(`/api/organizations/tree?${query.toString()}`);
+}
+
+export function getOrganizationChildren(orgId: string) {
+  return request<ApiResult<Organization[]>>(`/api/organizations/${encodeURIComponent(orgId)}/children`);
+}
+
+export type SearchEntityType = 'organization' | 'employee' | 'position';
+
+export function searchEntities(params: { q: string; types?: SearchEntityType[]; org_id?: string; limit?: number }) {
+  const query = new URLSearchParams({ q: params.q });
+  if (params.types?.length) query.set('types', params.types.join(','));
+  if (params.org_id) query.set('org_id', params.org_id);
+  if (params.limit) query.set('limit', String(params.limit));
+  return request<
+    ApiResult<{ type: SearchEntityType; id: string; name: string; label: string; organization_id: string }[]>
+  >(`/api/search?${query.toString()}`);
+}
+
 export function getMock(resource: 'job_fit', params?: Record<string, string>) {
   const query = params ? `?${new URLSearchParams(params).toString()}` : '';
   return request<ApiResult<Record<string, unknown>>>(`/api/mock/${resource}${query}`);
 }
 
+export function getTrends(params: {
+  org_id: string;
+  metric?: string;
+  start?: string;
+  end?: string;
+  granularity?: 'day' | 'week' | 'month';
+}) {
+  const query = new URLSearchParams(
+    Object.entries(params).filter((entry): entry is [string, string] => Boolean(entry[1]))
+  ).toString();
+  return request<ApiResult<{ period: string; score: number }[]>>(`/api/trends?${query}`);
+}
+
 export function generateAction(payload: { object_type: string; object_id: string; action_type: string }) {
   return request<ApiResult<{ action_id: string; expected_impact: string }>>('/api/action/generate', {
     method: 'POST',
@@ -91,11 +127,18 @@ export function updateAction(payload: {
 }
 
 export function simulateJobFit(payload: { employee: string; role: string; org_id: string }) {
-  return request<ApiResult<{ match: number; performance: number; risk: number; reason: string }>>(
-    '/api/simulate/jobfit',
-    {
-      method: 'POST',
-      body: JSON.stringify(payload),
-    }
-  );
+  return request<
+    ApiResult<{
+      match: number;
+      performance: number;
+      risk: number;
+      reason: string;
+      hardMismatch?: boolean;
+      missingCapabilities?: string[];
+      surplusCapabilities?: string[];
+    }>
+  >('/api/simulate/jobfit', {
+    method: 'POST',
+    body: JSON.stringify(payload),
+  });
 }
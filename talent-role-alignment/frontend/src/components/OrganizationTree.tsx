@@ -1,7 +1,7 @@
-import React, { useEffect, useMemo, useState } from 'react';
+import React, { useCallback, useEffect, useMemo, useState } from 'react';
 import { Card, Empty, Spin, Tree } from 'antd';
-import { getOrganizations } from '../api';
-import { Organization, useOrganization } from '../context/OrganizationContext';
+import { getOrganizationChildren, getOrganizationTree } from '../api';
+import { Organization, OrganizationNode, useOrganization } from '../context/OrganizationContext';
 
 type TreeVariant = 'jobfit';
 
@@ -14,6 +14,19 @@ function metricLabel(org: Organization, _variant: TreeVariant) {
   return `匹配度 ${metrics.job_fit ?? clampScore(metrics.health_score * 0.9)}`;
 }
 
+function flattenNodes(nodes: OrganizationNode[], result: Organization[] = []) {
+  nodes.forEach(({ children, ...org }) => {
+    result.push(org);
+    if (children) flattenNodes(children, result);
+  });
+  return result;
+}
+
+function mergeOrganizations(current: Organization[], incoming: Organization[]) {
+  const known = new Set(current.map((org) => org.id));
+  return [...current, ...incoming.filter((org) => !known.has(org.id))];
+}
+
 function buildTree(orgs: Organization[], variant: TreeVariant) {
   const nodeMap = new Map<string, any>();
   const roots: any[] = [];
@@ -27,6 +40,7 @@ function buildTree(orgs: Organization[], variant: TreeVariant) {
           <span className="text-xs text-ink-500">{metricLabel(org, variant)}</span>
         </div>
       ),
+      isLeaf: (org.child_count ?? 0) === 0,
       children: [],
     });
   });
@@ -40,6 +54,11 @@ function buildTree(orgs: Organization[], variant: TreeVariant) {
     }
   });
 
+  // Nodes whose children have not been fetched yet stay expandable and load on demand.
+  nodeMap.forEach((node) => {
+    if (node.children.length === 0) node.children = undefined;
+  });
+
   return roots;
 }
 
@@ -57,11 +76,12 @@ export default function OrganizationTree({
   useEffect(() => {
     if (organizations.length > 0) return;
     setLoading(true);
-    getOrganizations()
+    getOrganizationTree({ depth: 1 })
       .then((result) => {
-        setOrganizations(result.data);
-        if (!selectedOrgId && result.data.length > 0) {
-          setSelectedOrgId(result.data[0].id);
+        const loaded = flattenNodes(result.data);
+        setOrganizations(loaded);
+        if (!selectedOrgId && loaded.length > 0) {
+          setSelectedOrgId(loaded[0].id);
         }
       })
       .catch(() => {
@@ -70,6 +90,14 @@ export default function OrganizationTree({
       .finally(() => setLoading(false));
   }, [organizations.length, selectedOrgId, setOrganizations, setSelectedOrgId]);
 
+  const loadChildren = useCallback(
+    async ({ key }: { key: React.Key }) => {
+      const result = await getOrganizationChildren(String(key));
+      setOrganizations((current) => mergeOrganizations(current, result.data));
+    },
+    [setOrganizations]
+  );
+
   return (
     <Card className="shadow-card">
       <div className="text-sm uppercase tracking-[0.2em] text-ink-500">{title}</div>
@@ -85,6 +113,7 @@ export default function OrganizationTree({
         <Tree
           className="mt-3"
           treeData={treeData}
+          loadData={loadChildren}
           selectedKeys={[selectedOrgId]}
           onSelect={(keys) => {
             const id = keys[0] as string | undefined;
@@ -0,0 +1,79 @@
+import React, { useEffect, useRef, useState } from 'react';
+import { Select, Spin } from 'antd';
+import { SearchEntityType, searchEntities } from '../api';
+
+type Option = { label: string; value: string };
+
+type SearchSelectProps = {
+  type: SearchEntityType;
+  value?: string;
+  label?: string;
+  onChange: (value?: string, label?: string) => void;
+  orgId?: string;
+  placeholder?: string;
+  allowClear?: boolean;
+};
+
+export default function SearchSelect({
+  type,
+  value,
+  label,
+  onChange,
+  orgId,
+  placeholder,
+  allowClear,
+}: SearchSelectProps) {
+  const [keyword, setKeyword] = useState('');
+  const [results, setResults] = useState<Option[]>([]);
+  const [selected, setSelected] = useState<Option | null>(null);
+  const [loading, setLoading] = useState(false);
+  const requestId = useRef(0);
+
+  useEffect(() => {
+    if (!keyword.trim()) {
+      setResults([]);
+      return;
+    }
+    const current = ++requestId.current;
+    const timer = window.setTimeout(() => {
+      setLoading(true);
+      searchEntities({ q: keyword, types: [type], org_id: orgId })
+        .then((result) => {
+          if (current !== requestId.current) return;
+          setResults(result.data.map((item) => ({ label: item.label, value: item.id })));
+        })
+        .catch(() => {
+          if (current === requestId.current) setResults([]);
+        })
+        .finally(() => {
+          if (current === requestId.current) setLoading(false);
+        });
+    }, 200);
+    return () => window.clearTimeout(timer);
+  }, [keyword, orgId, type]);
+
+  // Keeps the chosen label once search results are cleared.
+  const current =
+    value === undefined
+      ? []
+      : [selected?.value === value ? selected : { label: label || value, value }];
+
+  return (
+    <Select
+      showSearch
+      value={value}
+      onChange={(next, option) => {
+        const chosen = next === undefined ? null : (option as Option);
+        setKeyword('');
+        setSelected(chosen);
+        onChange(next, chosen?.label);
+      }}
+      onSearch={setKeyword}
+      options={keyword.trim() ? results : current}
+      filterOption={false}
+      allowClear={allowClear}
+      placeholder={placeholder}
+      notFoundContent={loading ? <Spin size="small" /> : null}
+    />
+  );
+}
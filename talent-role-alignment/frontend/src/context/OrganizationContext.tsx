@@ -12,13 +12,19 @@ export type Organization = {
   parent_id: string | null;
   level: 'group' | 'bu' | 'department';
   metrics: OrganizationMetrics;
+  child_count?: number;
+  descendant_count?: number;
+};
+
+export type OrganizationNode = Organization & {
+  children?: OrganizationNode[];
 };
 
 type OrganizationContextValue = {
   organizations: Organization[];
   selectedOrgId: string;
   setSelectedOrgId: (id: string) => void;
-  setOrganizations: (orgs: Organization[]) => void;
+  setOrganizations: React.Dispatch<React.SetStateAction<Organization[]>>;
 };
 
 const OrganizationContext = createContext<OrganizationContextValue | null>(null);
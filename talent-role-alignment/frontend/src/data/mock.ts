@@ -1,14 +1,4 @@
 export const jobFitMock = {
-  employeeOptions: [
-    { label: '王敏｜产品事业部｜产品经理', value: 'emp_001' },
-    { label: '李昊｜增长产品部｜数据分析师', value: 'emp_002' },
-    { label: '陈佳｜产品事业部｜增长产品经理', value: 'emp_003' },
-  ],
-  roleOptions: [
-    { label: '产品经理', value: 'pos_product_manager' },
-    { label: '数据分析师', value: 'pos_data_analyst' },
-    { label: '销售经理', value: 'pos_sales_manager' },
-  ],
   summary: {
     avgMatch: 78,
     level: '中匹配',
@@ -163,16 +153,6 @@ export const jobFitMockByOrg: Record<string, typeof jobFitMock> = {
   org_group: jobFitMock,
   org_bu_sales: {
     ...jobFitMock,
-    employeeOptions: [
-      { label: '刘思｜销售事业部｜销售经理', value: 'emp_101' },
-      { label: '吴凯｜销售事业部｜运营主管', value: 'emp_102' },
-      { label: '赵航｜销售事业部｜客户成功', value: 'emp_103' },
-    ],
-    roleOptions: [
-      { label: '销售经理', value: 'pos_sales_manager' },
-      { label: '客户成功', value: 'pos_customer_success' },
-      { label: '运营主管', value: 'pos_operations_lead' },
-    ],
     summary: {
       avgMatch: 72,
       level: '中匹配',
@@ -3,7 +3,8 @@ import { Button, Card, Col, Row, Table, Tag, message, Select, Modal, Form, Input
 import SectionHeader from '../components/SectionHeader';
 import InsightCard from '../components/InsightCard';
 import OrganizationTree from '../components/OrganizationTree';
-import { generateAction, getMock, listActions, simulateJobFit, updateAction } from '../api';
+import SearchSelect from '../components/SearchSelect';
+import { generateAction, getMock, getTrends, listActions, simulateJobFit, updateAction } from '../api';
 import { OrganizationMetrics, useOrganization } from '../context/OrganizationContext';
 import { jobFitMock, jobFitMockByOrg } from '../data/mock';
 
@@ -91,6 +92,14 @@ const fireAction = async (objectType: 'Organization' | 'Employee' | 'Position',
   }
 };
 
+const TREND_PERIODS = 12;
+
+const trendStartDate = () => {
+  const now = new Date();
+  const start = new Date(now.getFullYear(), now.getMonth() - (TREND_PERIODS - 1), 1);
+  return `${start.getFullYear()}-${String(start.getMonth() + 1).padStart(2, '0')}-01`;
+};
+
 const calcTrendDelta = (series: { period: string; score: number }[] | undefined) => {
   if (!series || series.length < 2) return null;
   const latest = series[series.length - 1].score;
@@ -204,26 +213,27 @@ type ActionItem = {
   effort_time?: string;
 };
 
+const mentions = (input: string, name?: string) =>
+  Boolean(name) && (input.includes(name as string) || (name as string).includes(input));
+
 const findEmployeeByInput = (
   input: string,
-  options: { label: string; value: string }[] | undefined
+  byEmployee: Record<string, { employee: string }> | undefined
 ) => {
-  if (!input || !options) return null;
-  const hit = options.find((option) => option.label.includes(input.trim()));
-  if (hit) return hit.value;
-  const nameHit = options.find((option) => option.label.split('｜')[0] === input.trim());
-  return nameHit ? nameHit.value : null;
+  if (!input || !byEmployee) return null;
+  const hit = Object.entries(byEmployee).find(([, detail]) => mentions(input.trim(), detail.employee));
+  return hit ? hit[0] : null;
 };
 
-const findRoleByInput = (
-  input: string,
-  options: { label: string; value: string }[] | undefined
-) => {
-  if (!input || !options) return null;
-  const hit = options.find((option) => option.label.includes(input.trim()));
-  return hit ? hit.value : null;
+const findRoleByInput = (input: string, byRole: Record<string, { role: string }[]> | undefined) => {
+  if (!input || !byRole) return null;
+  const hit = Object.entries(byRole).find(([, rows]) => mentions(input.trim(), rows[0]?.role));
+  return hit ? hit[0] : null;
 };
 
+const findRoleIdByName = (name: string, byRole: Record<string, { role: string }[]> | undefined) =>
+  Object.entries(byRole ?? {}).find(([, rows]) => rows[0]?.role === name)?.[0];
+
 const buildPersonSuggestions = (singleMatch: typeof defaultData.singleMatch, employeeId: string): ActionSuggestion[] => {
   const missing = singleMatch.missingCapabilities ?? [];
   const surplus = singleMatch.surplusCapabilities ?? [];
@@ -488,7 +498,7 @@ const overview = (
         <InsightCard
           label="AI 匹配度总结论"
           title={`当前匹配度 ${currentMatch}`}
-          description={`关键发现：${data.summary.keyFinding}`}
+          description={`关键发现：${data.summary.keyFinding ?? '暂无'}`}
           footer={
             <div className="flex flex-wrap gap-2 text-sm text-ink-500">
               <Tag color="blue">{formatTrendLabel(trendDelta)}</Tag>
@@ -643,6 +653,7 @@ const overview = (
 const personProfile = (
   data: typeof defaultData,
   employee: string,
+  employeeLabel: string,
   singleMatch: typeof defaultData.singleMatch,
   personSimResult: {
     match: number;
@@ -667,10 +678,7 @@ const personProfile = (
   onOpenHistory: () => void,
   suggestions: ActionSuggestion[]
 ) => {
-  const selectedLabel = data.employeeOptions.find((option) => option.value === employee)?.label as
-    | string
-    | undefined;
-  const { department } = parseEmployeeLabel(selectedLabel);
+  const { department } = parseEmployeeLabel(employeeLabel);
   const profileModel = buildPersonProfileModel(singleMatch);
   const profileMatchScore = profileModel.length
     ? Math.round(profileModel.reduce((sum, item) => sum + item.current * item.weight, 0))
@@ -836,10 +844,10 @@ const roleProfile = (
   data: typeof defaultData,
   role: string,
   positionDistribution: typeof defaultData.positionDistribution,
-  onRoleChange: (value?: string) => void,
+  onRoleChange: (value?: string, label?: string) => void,
   onOrgChange: (value: string) => void,
   orgOptions: { label: string; value: string }[],
-  roleOptions: { label: string; value: string }[],
+  roleLabel: string,
   roleOrgId: string,
   roleProfile?: RoleProfileData,
   insight?: string,
@@ -886,17 +894,14 @@ const roleProfile = (
         <Card className="shadow-card">
           <SectionHeader title="岗位匹配分布" description="高/中/低匹配人数" />
           <div className="mt-4 grid gap-4 rounded-xl border border-mist-100 p-4 md:grid-cols-3">
-            <Select
-              showSearch
+            <SearchSelect
+              type="position"
               value={role || undefined}
+              label={roleLabel}
               onChange={onRoleChange}
-              options={roleOptions}
-              optionFilterProp="label"
+              orgId={roleOrgId === 'all' ? undefined : roleOrgId}
               allowClear
               placeholder="搜索并选择岗位"
-              filterOption={(input, option) =>
-                (option?.label as string)?.toLowerCase().includes(input.toLowerCase())
-              }
             />
             <Select
               showSearch
@@ -1034,11 +1039,13 @@ const roleProfile = (
 
 const simulator = (
   employee: string,
+  employeeLabel: string,
   role: string,
+  roleLabel: string,
   result: { match: number; performance: number; risk: number; reason: string } | null,
   onSimulate: () => void,
-  onChange: (key: 'employee' | 'role', value: string) => void,
-  data: typeof defaultData
+  onChange: (key: 'employee' | 'role', value?: string, label?: string) => void,
+  orgId?: string
 ) => (
   <div className="space-y-6">
     <Card className="shadow-card">
@@ -1052,11 +1059,21 @@ const simulator = (
         }
       />
       <div className="mt-4 grid gap-4 rounded-xl border border-mist-100 p-4 md:grid-cols-2">
-        <Select value={employee} onChange={(value) => onChange('employee', value)} options={data.employeeOptions} />
-        <Select
-          value={role}
-          onChange={(value) => onChange('role', value)}
-          options={data.roleOptions}
+        <SearchSelect
+          type="employee"
+          value={employee || undefined}
+          label={employeeLabel}
+          onChange={(value, label) => onChange('employee', value, label)}
+          orgId={orgId}
+          placeholder="搜索并选择员工"
+        />
+        <SearchSelect
+          type="position"
+          value={role || undefined}
+          label={roleLabel}
+          onChange={(value, label) => onChange('role', value, label)}
+          orgId={orgId}
+          placeholder="搜索并选择岗位"
         />
       </div>
     </Card>
@@ -1093,9 +1110,12 @@ const simulator = (
 export default function JobFit() {
   const { selectedOrgId, organizations } = useOrganization();
   const [mockData, setMockData] = React.useState(defaultData);
+  const [trendSeries, setTrendSeries] = React.useState<{ period: string; score: number }[]>([]);
   const [loadedOrgId, setLoadedOrgId] = React.useState<string | null>(null);
   const [employee, setEmployee] = React.useState('');
+  const [employeeLabel, setEmployeeLabel] = React.useState('');
   const [role, setRole] = React.useState('');
+  const [roleLabel, setRoleLabel] = React.useState('');
   const [roleOrgId, setRoleOrgId] = React.useState('all');
   const [personSelected, setPersonSelected] = React.useState(false);
   const [roleSelected, setRoleSelected] = React.useState(false);
@@ -1233,15 +1253,18 @@ export default function JobFit() {
   }, [selectedOrgId]);
 
   React.useEffect(() => {
-    const employeeValues = mockData.employeeOptions?.map((option) => option.value) ?? [];
-    if (personSelected && employeeValues.length > 0 && !employeeValues.includes(employee)) {
-      setEmployee(employeeValues[0]);
-    }
-    const roleValues = mockData.roleOptions?.map((option) => option.value) ?? [];
-    if (roleSelected && roleValues.length > 0 && !roleValues.includes(role)) {
-      setRole(roleValues[0]);
-    }
-  }, [employee, mockData.employeeOptions, mockData.roleOptions, personSelected, role, roleSelected]);
+    const orgId = selectedOrgId || 'org_group';
+    getTrends({ org_id: orgId, start: trendStartDate(), granularity: 'month' })
+      .then((result) => {
+        setTrendSeries(
+          result.data.map((item) => ({
+            period: `${Number(item.period.slice(5, 7))}月`,
+            score: Math.round(item.score),
+          }))
+        );
+      })
+      .catch(() => setTrendSeries([]));
+  }, [selectedOrgId]);
 
   const roleOrgOptions = React.useMemo(
     () => [
@@ -1254,23 +1277,6 @@ export default function JobFit() {
     []
   );
 
-  const roleOptions = React.useMemo(() => {
-    if (roleOrgId === 'all') {
-      return mockData.roleOptions ?? [];
-    }
-    const scoped = jobFitMockByOrg[roleOrgId]?.roleOptions ?? [];
-    return scoped.length > 0 ? scoped : mockData.roleOptions ?? [];
-  }, [mockData.roleOptions, roleOrgId]);
-
-  React.useEffect(() => {
-    if (roleOrgId === 'all') return;
-    const scopedRoles = jobFitMockByOrg[roleOrgId]?.roleOptions ?? [];
-    const values = scopedRoles.map((option) => option.value);
-    if (values.length > 0 && !values.includes(role)) {
-      setRole(values[0]);
-    }
-  }, [role, roleOrgId]);
-
   React.useEffect(() => {
     if (!selectedOrgId) return;
     const payload = { object_type: 'Organization' as const, object_id: selectedOrgId };
@@ -1333,13 +1339,15 @@ export default function JobFit() {
     refreshActionStatus();
   }, [refreshActionStatus]);
 
-  const handleChange = (key: 'employee' | 'role', value?: string) => {
+  const handleChange = (key: 'employee' | 'role', value?: string, label?: string) => {
     if (key === 'employee') {
       setEmployee(value ?? '');
+      setEmployeeLabel(label ?? '');
       setPersonSelected(Boolean(value));
     }
     if (key === 'role') {
       setRole(value ?? '');
+      setRoleLabel(label ?? '');
       setRoleSelected(Boolean(value));
     }
   };
@@ -1386,21 +1394,16 @@ export default function JobFit() {
   const handleSendPersonChat = () => {
     if (!personChatInput.trim()) return;
     const input = personChatInput.trim();
-    const employeeId = findEmployeeByInput(input, mockData.employeeOptions);
-    const roleId = findRoleByInput(input, mockData.roleOptions);
-    const fallbackEmployee = mockData.employeeOptions?.[0]?.value;
+    const employeeId = findEmployeeByInput(input, mockData.singleMatchByEmployee);
+    const roleId = findRoleByInput(input, mockData.roleDistributionById);
+    const fallbackEmployee = Object.keys(mockData.singleMatchByEmployee ?? {})[0];
     const resolvedEmployee = employeeId ?? (employee || fallbackEmployee);
-    if (employeeId) {
-      setEmployee(employeeId);
-      setPersonSelected(true);
-    }
-    if (!employeeId && resolvedEmployee && resolvedEmployee !== employee) {
-      setEmployee(resolvedEmployee);
-      setPersonSelected(true);
+    if (resolvedEmployee && resolvedEmployee !== employee) {
+      const detail = mockData.singleMatchByEmployee?.[resolvedEmployee];
+      handleChange('employee', resolvedEmployee, detail ? `${detail.employee}｜｜${detail.role}` : '');
     }
     if (roleId) {
-      setRole(roleId);
-      setRoleSelected(true);
+      handleChange('role', roleId, mockData.roleDistributionById?.[roleId]?.[0]?.role);
     }
     const matchData =
       resolvedEmployee && mockData.singleMatchByEmployee
@@ -1472,10 +1475,7 @@ export default function JobFit() {
       message.info('请先选择员工');
       return;
     }
-    const selectedLabel = mockData.employeeOptions?.find((option) => option.value === employee)?.label as
-      | string
-      | undefined;
-    const { department, role: employeeRole } = parseEmployeeLabel(selectedLabel);
+    const { department, role: employeeRole } = parseEmployeeLabel(employeeLabel);
     const report = [
       '个人岗位匹配度分析报告',
       `员工：${singleMatch.employee}`,
@@ -1501,11 +1501,11 @@ export default function JobFit() {
       message.info('请先选择岗位');
       return;
     }
-    const roleLabel = mockData.roleOptions?.find((option) => option.value === role)?.label ?? role;
+    const roleName = roleLabel || role;
     const matchScore = roleProfileData?.model ? calcRoleMatchScore(roleProfileData.model) : 0;
     const report = [
       '岗位匹配度分析报告',
-      `岗位：${roleLabel}`,
+      `岗位：${roleName}`,
       `岗位匹配度：${matchScore}`,
       `整体分析：${roleInsight}`,
     ].join('\n');
@@ -1513,7 +1513,7 @@ export default function JobFit() {
     const url = URL.createObjectURL(blob);
     const link = document.createElement('a');
     link.href = url;
-    link.download = `岗位匹配度分析报告-${roleLabel}.txt`;
+    link.download = `岗位匹配度分析报告-${roleName}.txt`;
     link.click();
     URL.revokeObjectURL(url);
   };
@@ -1562,7 +1562,7 @@ export default function JobFit() {
         const fallbackScore = total
           ? Math.round((item.high * 85 + item.medium * 75 + item.low * 60) / total)
           : 0;
-        const roleId = mockData.roleOptions?.find((option) => option.label === item.role)?.value;
+        const roleId = findRoleIdByName(item.role, mockData.roleDistributionById);
         const profile = roleId ? mockData.roleProfilesById?.[roleId] : undefined;
         const matchScore = profile?.model ? calcRoleMatchScore(profile.model) : fallbackScore;
         return [item.role, matchScore, getMatchLevel(matchScore), getMatchRisk(matchScore)];
@@ -1711,7 +1711,7 @@ export default function JobFit() {
             const fallbackScore = total
               ? Math.round((item.high * 85 + item.medium * 75 + item.low * 60) / total)
               : 0;
-            const roleId = mockData.roleOptions?.find((option) => option.label === item.role)?.value;
+            const roleId = findRoleIdByName(item.role, mockData.roleDistributionById);
             const profile = roleId ? mockData.roleProfilesById?.[roleId] : undefined;
             const matchScore = profile?.model ? calcRoleMatchScore(profile.model) : fallbackScore;
             return {
@@ -1744,7 +1744,7 @@ export default function JobFit() {
   const groupedOverviewSuggestions = groupSuggestions(overviewSuggestionView).slice(5);
   const selectedOrg = organizations.find((org) => org.id === selectedOrgId);
   const orgMatchScore = getOrgMatchScore(selectedOrg?.metrics);
-  const baseTrendSeries = mockData.trendSeries ?? [];
+  const baseTrendSeries = trendSeries.length > 0 ? trendSeries : mockData.trendSeries ?? [];
   const syncedTrendSeries =
     orgMatchScore !== null && baseTrendSeries.length > 0
       ? baseTrendSeries.map((item, index) =>